@@ -16,29 +16,104 @@ Instructions:
 3. Run: python scraper/batch_import_foodcom.py --limit 1000
 """
 
+import asyncio
 import csv
 import json
 import os
-import time
 import argparse
-from typing import List, Dict, Set
+import functools
+from typing import List, Dict, Set, Tuple
 from pathlib import Path
 import re
+import shutil
 
 # Import our legal recipe importer
 import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from legal_recipe_importer import LegalRecipeImporter
+from legal_recipe_importer import LegalRecipeImporter, MAX_BATCH_SIZE, MAX_CONCURRENCY
+from recipe_io import iter_recipes, append_recipes
+
+# Bloom filter keeps the duplicate index small on large databases (optional)
+try:
+    from pybloom_live import ScalableBloomFilter
+    BLOOM_AVAILABLE = True
+except ImportError:
+    BLOOM_AVAILABLE = False
+
+# Initial size covers the full Food.com dataset (~230k); the filters grow
+# past it as the database does
+BLOOM_CAPACITY = 500_000
+BLOOM_ERROR_RATE = 0.001
+
+# With --use-ai, recipes are rewritten this many at a time: enough for
+# MAX_CONCURRENCY batched Groq calls in flight at once
+AI_CHUNK_SIZE = MAX_BATCH_SIZE * MAX_CONCURRENCY
+
+# Food.com CSV columns used by parse_foodcom_row
+FOODCOM_COLUMNS = ('name', 'id', 'minutes', 'tags', 'steps', 'ingredients')
+
+# Descriptor words that don't change the recipe (ignored when comparing names)
+IGNORE_WORDS = frozenset([
+    'the', 'a', 'an', 'perfect', 'classic', 'easy', 'simple',
+    'best', 'homemade', 'ultimate', 'authentic', 'traditional',
+    'quick', 'delicious', 'amazing', 'favorite'
+])
+
+# Characters that are neither word characters nor whitespace get removed.
+# ASCII names use a translate table built from the same regex; other
+# names (dashes, guillemets, accents...) go through the regex itself.
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_ASCII_NON_WORD_TABLE = str.maketrans('', '', ''.join(c for c in map(chr, range(128)) if _NON_WORD_RE.match(c)))
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_name(name: str) -> str:
+    """
+    Normalize recipe name for fuzzy duplicate detection.
+    
+    Cached: a candidate's name is normalized once for the duplicate check
+    and again when it is added to the index after import.
+    """
+    if not name:
+        return ""
+    
+    # Lowercase
+    normalized = name.lower().strip()
+    
+    # Remove common descriptor words that don't change the recipe
+    words = normalized.split()
+    words = [w for w in words if w not in IGNORE_WORDS]
+    normalized = ' '.join(words)
+    
+    # Remove special characters
+    if normalized.isascii():
+        normalized = normalized.translate(_ASCII_NON_WORD_TABLE)
+    else:
+        normalized = _NON_WORD_RE.sub('', normalized)
+    
+    # Remove extra spaces
+    normalized = _WHITESPACE_RE.sub(' ', normalized).strip()
+    
+    # Return empty if normalization results in very short string
+    if len(normalized) < 3:
+        return ""
+    
+    return normalized
+
 
 class FoodComImporter:
     """Imports recipes from Food.com CSV with duplicate detection."""
     
     def __init__(self, groq_api_key: str = None):
         """Initialize importer."""
-        self.legal_importer = LegalRecipeImporter(groq_api_key)
-        self.existing_recipes = []
+        self._groq_api_key = groq_api_key
+        self._legal_importer = None
+        self.existing_count = 0
         self.existing_names = set()
         self.existing_ids = set()
+        self._name_bloom = None
+        self._id_bloom = None
         self.stats = {
             'processed': 0,
             'imported': 0,
@@ -46,74 +121,78 @@ class FoodComImporter:
             'errors': 0
         }
     
+    @property
+    def legal_importer(self) -> LegalRecipeImporter:
+        """Legal recipe importer, created on first use (i.e. first recipe that survives filtering)."""
+        if self._legal_importer is None:
+            self._legal_importer = LegalRecipeImporter(self._groq_api_key)
+        return self._legal_importer
+    
     def load_existing_recipes(self, db_path: str):
-        """Load existing recipes to check for duplicates."""
+        """Load existing recipe names/ids to check for duplicates."""
+        # Only name and id are needed, so recipes are streamed and discarded
+        # instead of keeping the whole database in memory
+        self.existing_count = 0
         try:
-            with open(db_path, 'r', encoding='utf-8') as f:
-                self.existing_recipes = json.load(f)
+            # Build lookup index for fast duplicate checking. With pybloom-live
+            # installed, existing names/ids only live in the Bloom filters;
+            # the exact sets then hold just the recipes added during this run.
+            if BLOOM_AVAILABLE:
+                self._name_bloom = ScalableBloomFilter(initial_capacity=BLOOM_CAPACITY, error_rate=BLOOM_ERROR_RATE)
+                self._id_bloom = ScalableBloomFilter(initial_capacity=BLOOM_CAPACITY, error_rate=BLOOM_ERROR_RATE)
+                names, ids = self._name_bloom, self._id_bloom
+            else:
+                names, ids = self.existing_names, self.existing_ids
             
-            # Build lookup sets for fast duplicate checking
-            for recipe in self.existing_recipes:
-                self.existing_names.add(self._normalize_name(recipe.get('name', '')))
-                self.existing_ids.add(recipe.get('id', ''))
+            for recipe in iter_recipes(db_path):
+                names.add(self._normalize_name(recipe.get('name', '')))
+                ids.add(recipe.get('id', ''))
+                self.existing_count += 1
             
-            print(f"📊 Loaded {len(self.existing_recipes)} existing recipes")
+            print(f"📊 Loaded {self.existing_count} existing recipes")
             
         except FileNotFoundError:
             print("📊 Starting with empty database")
-            self.existing_recipes = []
     
     def _normalize_name(self, name: str) -> str:
         """Normalize recipe name for fuzzy duplicate detection."""
-        if not name:
-            return ""
-        
-        # Lowercase
-        normalized = name.lower().strip()
-        
-        # Remove common descriptor words that don't change the recipe
-        ignore_words = [
-            'the', 'a', 'an', 'perfect', 'classic', 'easy', 'simple',
-            'best', 'homemade', 'ultimate', 'authentic', 'traditional',
-            'quick', 'delicious', 'amazing', 'favorite'
-        ]
-        words = normalized.split()
-        words = [w for w in words if w not in ignore_words]
-        normalized = ' '.join(words)
-        
-        # Remove special characters
-        normalized = re.sub(r'[^\w\s]', '', normalized)
-        
-        # Remove extra spaces
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        # Return empty if normalization results in very short string
-        if len(normalized) < 3:
-            return ""
-        
-        return normalized
+        return normalize_name(name)
     
     def is_duplicate(self, recipe_name: str, recipe_id: str) -> bool:
         """Check if recipe is a duplicate."""
-        # Skip validation if name is empty/too short
-        if not recipe_name or len(recipe_name.strip()) < 3:
-            return False  # Let validation handle it later
-        
-        # Check by ID first
-        if recipe_id in self.existing_ids:
+        # Check by ID first (cheap, no normalization needed)
+        if self._seen(recipe_id, self._id_bloom, self.existing_ids):
             return True
         
+        # Skip name check if name is empty/too short
+        if not recipe_name or len(recipe_name) < 3:
+            return False  # Let validation handle it later
+        
         # Check by normalized name
         normalized_name = self._normalize_name(recipe_name)
-        if normalized_name and normalized_name in self.existing_names:
+        if normalized_name and self._seen(normalized_name, self._name_bloom, self.existing_names):
             return True
         
         return False
     
-    def parse_foodcom_row(self, row: Dict) -> Dict:
+    @staticmethod
+    def _seen(key: str, bloom, exact: Set[str]) -> bool:
+        """
+        Membership test against the Bloom filter (existing database) and the
+        exact set (recipes added this run). A Bloom false positive (~0.1%)
+        only means a candidate gets skipped, never a duplicate imported.
+        """
+        if key in exact:
+            return True
+        return bloom is not None and key in bloom
+    
+    def parse_foodcom_row(self, row: List[str], columns: Tuple[int, ...]) -> Dict:
         """
         Parse a Food.com CSV row into our format.
         
+        The row is a plain list from csv.reader; columns holds the index of
+        each FOODCOM_COLUMNS entry (looked up once from the header row).
+        
         Food.com columns:
         - name: recipe name
         - id: recipe id
@@ -128,17 +207,23 @@ class FoodComImporter:
         - ingredients: JSON list
         - n_ingredients: count
         """
+        name_i, id_i, minutes_i, tags_i, steps_i, ingredients_i = columns
         try:
             # Parse JSON fields
-            tags = json.loads(row.get('tags', '[]'))
-            steps = json.loads(row.get('steps', '[]'))
-            ingredients = json.loads(row.get('ingredients', '[]'))
+            tags = json.loads(row[tags_i] or '[]')
+            steps = json.loads(row[steps_i] or '[]')
+            ingredients = json.loads(row[ingredients_i] or '[]')
+            
+            # Intern tags and ingredient names: the same few thousand strings
+            # repeat across most rows, so recipes share one copy of each
+            tags = [sys.intern(t) for t in tags]
+            ingredients = [sys.intern(ing) for ing in ingredients]
             
             # Clean up tags (remove generic ones)
             cleaned_tags = [t for t in tags if len(t) > 2 and t not in ['preparation', 'time-to-make']]
             
             # Estimate times
-            total_minutes = int(row.get('minutes', 30))
+            total_minutes = int(row[minutes_i] or 30)
             prep_time = min(total_minutes // 3, 30)  # Estimate 1/3 is prep
             cook_time = total_minutes - prep_time
             
@@ -178,9 +263,9 @@ class FoodComImporter:
             
             # Build raw recipe
             raw_recipe = {
-                'id': f"foodcom_{row.get('id', '')}",
+                'id': f"foodcom_{row[id_i]}",
                 'source': 'Food.com Dataset',
-                'name': row.get('name', '').strip(),
+                'name': row[name_i].strip(),
                 'ingredients': ingredients,
                 'steps': steps,
                 'cook_time': cook_time,
@@ -223,18 +308,22 @@ class FoodComImporter:
         print(f"🐛 Debug mode: {'Enabled' if debug else 'Disabled'}")
         
         new_recipes = []
+        pending = []  # --use-ai: recipes waiting for the next batched rewrite
         rows_checked = 0
         max_rows_to_check = limit * 20  # Check at most 20x the limit
         
         try:
             with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
+                # Positional reader avoids building a dict per row
+                reader = csv.reader(f)
+                header = next(reader)
+                columns = tuple(header.index(col) for col in FOODCOM_COLUMNS)
                 
                 for i, row in enumerate(reader):
                     rows_checked += 1
                     
                     # Stop if we've reached limit
-                    if len(new_recipes) >= limit:
+                    if len(new_recipes) + len(pending) >= limit:
                         print(f"✅ Reached target of {limit} recipes!")
                         break
                     
@@ -249,7 +338,7 @@ class FoodComImporter:
                         print(f"📊 Checked {rows_checked} rows → imported {len(new_recipes)}, duplicates {self.stats['duplicates']}, errors {self.stats['errors']}")
                     
                     # Parse row
-                    raw_recipe = self.parse_foodcom_row(row)
+                    raw_recipe = self.parse_foodcom_row(row, columns)
                     if not raw_recipe:
                         self.stats['errors'] += 1
                         if debug and i < 10:
@@ -284,28 +373,28 @@ class FoodComImporter:
                             print(f"  🔄 Row {i}: {raw_recipe['name']} - Duplicate")
                         continue
                     
+                    # AI rewriting goes through batched, concurrent Groq calls
+                    # one chunk at a time (rate limits are retried with backoff)
+                    if use_ai:
+                        pending.append(raw_recipe)
+                        self.existing_names.add(self._normalize_name(raw_recipe['name']))
+                        self.existing_ids.add(raw_recipe['id'])
+                        if len(pending) >= AI_CHUNK_SIZE:
+                            self._create_ai_recipes(pending, new_recipes)
+                            pending = []
+                        continue
+                    
                     # Create legal recipe
                     try:
-                        legal_recipe = self.legal_importer.create_legal_recipe(raw_recipe, use_ai=use_ai)
-                        new_recipes.append(legal_recipe)
-                        self.stats['imported'] += 1
-                        
-                        # Add to duplicate check sets
-                        self.existing_names.add(self._normalize_name(legal_recipe['name']))
-                        self.existing_ids.add(legal_recipe['id'])
-                        
-                        # Show progress for first few and every 50th
-                        if len(new_recipes) <= 5 or len(new_recipes) % 50 == 0:
-                            print(f"  ✅ [{len(new_recipes)}] {legal_recipe['name']} ({legal_recipe['total_time']} min)")
-                        
-                        # Rate limiting for AI (if using)
-                        if use_ai:
-                            time.sleep(2)  # 30 requests/min = 2 sec delay
-                        
+                        legal_recipe = self.legal_importer.create_legal_recipe(raw_recipe, use_ai=False)
+                        self._add_legal_recipe(legal_recipe, new_recipes)
                     except Exception as e:
                         print(f"  ⚠️ Error creating recipe: {e}")
                         self.stats['errors'] += 1
                         continue
+                
+                if pending:
+                    self._create_ai_recipes(pending, new_recipes)
         
         except Exception as e:
             print(f"❌ Error reading CSV: {e}")
@@ -313,22 +402,43 @@ class FoodComImporter:
         
         return new_recipes
     
-    def save_recipes(self, new_recipes: List[Dict], db_path: str):
-        """Save recipes to database."""
-        all_recipes = self.existing_recipes + new_recipes
+    def _add_legal_recipe(self, legal_recipe: Dict, new_recipes: List[Dict]):
+        """Record a created recipe: result list, stats, duplicate check sets and progress."""
+        new_recipes.append(legal_recipe)
+        self.stats['imported'] += 1
         
-        # Create backup
+        # Add to duplicate check sets
+        self.existing_names.add(self._normalize_name(legal_recipe['name']))
+        self.existing_ids.add(legal_recipe['id'])
+        
+        # Show progress for first few and every 50th
+        if len(new_recipes) <= 5 or len(new_recipes) % 50 == 0:
+            print(f"  ✅ [{len(new_recipes)}] {legal_recipe['name']} ({legal_recipe['total_time']} min)")
+    
+    def _create_ai_recipes(self, raw_recipes: List[Dict], new_recipes: List[Dict]):
+        """Create a chunk of legal recipes with AI content via bulk_create_legal_recipes."""
+        try:
+            legal_recipes = asyncio.run(self.legal_importer.bulk_create_legal_recipes(raw_recipes))
+        except Exception as e:
+            print(f"  ⚠️ Error creating recipes: {e}")
+            self.stats['errors'] += len(raw_recipes)
+            return
+        
+        for legal_recipe in legal_recipes:
+            self._add_legal_recipe(legal_recipe, new_recipes)
+    
+    def save_recipes(self, new_recipes: List[Dict], db_path: str):
+        """Append new recipes to the database."""
+        # Create backup (plain file copy, no re-serialization)
         if os.path.exists(db_path):
             backup_path = db_path.replace('.json', '.backup.json')
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(self.existing_recipes, f, indent=2, ensure_ascii=False)
+            shutil.copyfile(db_path, backup_path)
             print(f"💾 Backup saved to: {backup_path}")
         
-        # Save updated database
-        with open(db_path, 'w', encoding='utf-8') as f:
-            json.dump(all_recipes, f, indent=2, ensure_ascii=False)
+        # Only the new tail is written; existing recipes are left untouched
+        append_recipes(db_path, new_recipes)
         
-        print(f"✅ Saved {len(all_recipes)} total recipes to: {db_path}")
+        print(f"✅ Saved {self.existing_count + len(new_recipes)} total recipes to: {db_path}")
     
     def print_stats(self):
         """Print import statistics."""
@@ -379,7 +489,7 @@ def main():
         importer.print_stats()
         
         print(f"\n🎉 Successfully imported {len(new_recipes)} new recipes!")
-        print(f"📊 Total database size: {len(importer.existing_recipes) + len(new_recipes)} recipes")
+        print(f"📊 Total database size: {importer.existing_count + len(new_recipes)} recipes")
     else:
         print("\n⚠️ No new recipes imported.")
     
@@ -0,0 +1,118 @@
+"""
+BBC Food Spider
+===============
+
+Scrapy version of the BBC Food fetcher, for bulk runs over long URL lists.
+
+Scrapy supplies the concurrency, retries, on-disk HTTP cache and
+AutoThrottle; pages are still parsed by RecipeScraper.parse_bbc_food, so
+recipes come out exactly as they do from recipe_scraper.py. Only available
+when scrapy is installed:
+
+    pip install scrapy
+    python scraper/bbc_spider.py [--output data/bbc_recipes.json]
+"""
+
+import argparse
+import os
+from typing import Dict, Iterable, List
+
+from recipe_io import write_recipes
+from recipe_scraper import (
+    BBC_URLS, HTTP_CACHE_EXPIRE, MAX_PER_HOST, REQUESTS_PER_SECOND, USER_AGENT,
+    RecipeScraper, assign_ids, canonical_url,
+)
+
+try:
+    import scrapy
+    from scrapy import signals
+    from scrapy.crawler import CrawlerProcess
+    SCRAPY_AVAILABLE = True
+except ImportError:
+    SCRAPY_AVAILABLE = False
+
+# Same limits as recipe_scraper.py; AutoThrottle only ever slows down from here
+SPIDER_SETTINGS = {
+    'USER_AGENT': USER_AGENT,
+    'CONCURRENT_REQUESTS_PER_DOMAIN': MAX_PER_HOST,
+    'DOWNLOAD_DELAY': 1 / REQUESTS_PER_SECOND,
+    'DOWNLOAD_TIMEOUT': 10,
+    'AUTOTHROTTLE_ENABLED': True,
+    'RETRY_TIMES': 3,
+    'RETRY_HTTP_CODES': [429, 500, 502, 503, 504],
+    'HTTPCACHE_ENABLED': True,
+    'HTTPCACHE_DIR': 'bbc_food_cache',
+    'HTTPCACHE_EXPIRATION_SECS': HTTP_CACHE_EXPIRE,
+    'LOG_LEVEL': 'WARNING',
+}
+
+
+if SCRAPY_AVAILABLE:
+    class BBCFoodSpider(scrapy.Spider):
+        """Crawls BBC Food recipe pages and yields recipe dicts."""
+
+        name = 'bbc_food'
+        custom_settings = SPIDER_SETTINGS
+
+        def __init__(self, urls: Iterable[str] = BBC_URLS, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.start_urls = list(dict.fromkeys(map(canonical_url, urls)))
+            self.parser = RecipeScraper(use_cache=False)
+
+        def parse(self, response):
+            recipe = self.parser.parse_bbc_food(response.body, response.url)
+            if recipe.get('name'):
+                yield recipe
+
+        def closed(self, reason):
+            self.parser.close()
+
+
+def crawl_bbc_food(urls: Iterable[str] = BBC_URLS) -> List[Dict]:
+    """
+    Scrape BBC Food recipes with Scrapy (blocks until the crawl finishes).
+
+    Recipes come back in completion order, not URL order. Twisted's reactor
+    can't be restarted, so call this once per process.
+    """
+    if not SCRAPY_AVAILABLE:
+        raise ImportError("crawl_bbc_food needs scrapy (pip install scrapy)")
+
+    recipes = []
+
+    def collect(item, **kwargs):
+        recipes.append(item)
+
+    process = CrawlerProcess()
+    crawler = process.create_crawler(BBCFoodSpider)
+    crawler.signals.connect(collect, signal=signals.item_scraped)
+    process.crawl(crawler, urls=urls)
+    process.start()
+    return recipes
+
+
+def main() -> None:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='Crawl BBC Food recipes with Scrapy')
+    parser.add_argument('--output', default=os.path.join(script_dir, '..', 'data', 'bbc_recipes.json'),
+                        help='Where to write the scraped recipes (default: data/bbc_recipes.json)')
+    args = parser.parse_args()
+
+    if not SCRAPY_AVAILABLE:
+        print("⚠️ scrapy is not installed (pip install scrapy)")
+        return
+
+    print("🕷️ Crawling BBC Food with Scrapy...")
+    recipes = crawl_bbc_food()
+    for recipe in recipes:
+        print(f"  ✅ {recipe['name']}")
+
+    # Same ids as recipe_scraper.py would give them
+    assign_ids(recipes)
+    write_recipes(args.output, recipes)
+    print(f"\n📊 Scraped {len(recipes)} recipes")
+    print(f"💾 Saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,9 +4,24 @@ Compare old heuristic scores with new real-world popularity scores.
 Useful for validating the new system.
 """
 
-import json
+import heapq
+import re
 from pathlib import Path
 
+from recipe_io import iter_recipes
+
+# Dishes everyone searches for; these should score above average
+POPULAR_DISHES = [
+    "Pad Thai", "Pizza", "Fried Rice", "Pasta", "Tacos",
+    "Sushi", "Burger", "Curry", "Ramen", "Stir Fry"
+]
+
+# One alternation regex scans each name once instead of one `in` test per dish
+POPULAR_RE = re.compile('|'.join(map(re.escape, POPULAR_DISHES)), re.IGNORECASE)
+
+TOP_N = 10
+
+
 def compare_scoring_systems():
     """Compare old vs new popularity scores."""
     
@@ -15,18 +30,53 @@ def compare_scoring_systems():
     data_dir = script_dir.parent / 'data'
     recipes_file = data_dir / 'recipes.json'
     
-    with open(recipes_file, 'r', encoding='utf-8') as f:
-        recipes = json.load(f)
+    # Single streaming pass: running sums/min/max, bounded top-N heaps,
+    # invalid count and popular-dish matches are all updated per recipe
+    count = 0
+    has_old = has_new = False
+    old_total = new_total = 0.0
+    new_min = float('inf')
+    new_max = float('-inf')
+    invalid = 0
+    increases = []  # min-heaps of (key, -index, name, old, new), size <= TOP_N
+    decreases = []
+    popular_total = 0.0
+    popular_count = 0
+    
+    for r in iter_recipes(recipes_file):
+        old = r.get('popularity_score_old') or 0
+        new = r.get('popularity_score') or 0
+        name = r.get('name', 'Unknown')
+        
+        has_old = has_old or bool(old)
+        has_new = has_new or bool(new)
+        old_total += old
+        new_total += new
+        new_min = min(new_min, new)
+        new_max = max(new_max, new)
+        invalid += not (0 <= new <= 100)
+        
+        diff = new - old
+        if diff:
+            # Ties keep the earlier recipe, like a stable sort would
+            heap, key = (increases, diff) if diff > 0 else (decreases, -diff)
+            item = (key, -count, name, old, new)
+            if len(heap) < TOP_N:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        
+        if POPULAR_RE.search(name):
+            popular_total += new
+            popular_count += 1
+        
+        count += 1
     
     print("=" * 80)
     print("📊 POPULARITY SCORING COMPARISON")
     print("=" * 80)
     print()
     
-    # Check if we have both old and new scores
-    has_old = any(r.get('popularity_score_old') for r in recipes)
-    has_new = any(r.get('popularity_score') for r in recipes)
-    
     if not has_old or not has_new:
         print("⚠️  Not enough data to compare.")
         print(f"   Old scores: {'✅' if has_old else '❌'}")
@@ -36,11 +86,8 @@ def compare_scoring_systems():
         return
     
     # Calculate statistics
-    old_scores = [r.get('popularity_score_old', 0) for r in recipes]
-    new_scores = [r.get('popularity_score', 0) for r in recipes]
-    
-    old_avg = sum(old_scores) / len(old_scores)
-    new_avg = sum(new_scores) / len(new_scores)
+    old_avg = old_total / count
+    new_avg = new_total / count
     
     print(f"📈 Average Scores:")
     print(f"   Old (heuristic): {old_avg:.1f}")
@@ -49,32 +96,16 @@ def compare_scoring_systems():
     print()
     
     # Show recipes with biggest changes
-    changes = []
-    for r in recipes:
-        old = r.get('popularity_score_old', 0)
-        new = r.get('popularity_score', 0)
-        changes.append({
-            'name': r.get('name', 'Unknown'),
-            'old': old,
-            'new': new,
-            'diff': new - old
-        })
-    
-    # Sort by absolute change
-    changes.sort(key=lambda x: abs(x['diff']), reverse=True)
-    
     print("🔥 Top 10 Biggest Score INCREASES:")
-    increases = [c for c in changes if c['diff'] > 0]
-    for i, c in enumerate(increases[:10], 1):
-        print(f"   {i}. {c['name']}")
-        print(f"      {c['old']:.1f} → {c['new']:.1f} ({c['diff']:+.1f})")
+    for i, (_, _, name, old, new) in enumerate(sorted(increases, reverse=True), 1):
+        print(f"   {i}. {name}")
+        print(f"      {old:.1f} → {new:.1f} ({new - old:+.1f})")
     
     print()
     print("❄️  Top 10 Biggest Score DECREASES:")
-    decreases = [c for c in changes if c['diff'] < 0]
-    for i, c in enumerate(decreases[:10], 1):
-        print(f"   {i}. {c['name']}")
-        print(f"      {c['old']:.1f} → {c['new']:.1f} ({c['diff']:+.1f})")
+    for i, (_, _, name, old, new) in enumerate(sorted(decreases, reverse=True), 1):
+        print(f"   {i}. {name}")
+        print(f"      {old:.1f} → {new:.1f} ({new - old:+.1f})")
     
     print()
     print("=" * 80)
@@ -83,35 +114,21 @@ def compare_scoring_systems():
     print("\n🔍 Validation Checks:")
     
     # Check 1: Are all scores in valid range?
-    invalid = [r for r in recipes if not (0 <= r.get('popularity_score', 0) <= 100)]
     if invalid:
-        print(f"   ❌ {len(invalid)} recipes have invalid scores (not 0-100)")
+        print(f"   ❌ {invalid} recipes have invalid scores (not 0-100)")
     else:
         print(f"   ✅ All scores in valid range (0-100)")
     
     # Check 2: Is there enough variation?
-    score_range = max(new_scores) - min(new_scores)
+    score_range = new_max - new_min
     if score_range < 20:
         print(f"   ⚠️  Low score variation ({score_range:.1f} points)")
     else:
         print(f"   ✅ Good score variation ({score_range:.1f} points)")
     
     # Check 3: Are popular recipes scoring high?
-    popular_dishes = [
-        "Pad Thai", "Pizza", "Fried Rice", "Pasta", "Tacos",
-        "Sushi", "Burger", "Curry", "Ramen", "Stir Fry"
-    ]
-    
-    popular_in_db = []
-    for r in recipes:
-        name_lower = r.get('name', '').lower()
-        for dish in popular_dishes:
-            if dish.lower() in name_lower:
-                popular_in_db.append((r.get('name'), r.get('popularity_score', 0)))
-                break
-    
-    if popular_in_db:
-        avg_popular = sum(s for _, s in popular_in_db) / len(popular_in_db)
+    if popular_count:
+        avg_popular = popular_total / popular_count
         print(f"   📊 Known popular dishes average: {avg_popular:.1f}")
         if avg_popular > new_avg:
             print(f"   ✅ Popular dishes score above average")
@@ -121,4 +138,3 @@ def compare_scoring_systems():
 
 if __name__ == '__main__':
     compare_scoring_systems()
-
@@ -13,11 +13,41 @@ Keeps the best version based on:
 3. Has image URL
 """
 
-import json
 import os
+import argparse
 from pathlib import Path
 from collections import defaultdict
 import re
+import shutil
+import gzip
+import functools
+from multiprocessing import Pool, cpu_count
+
+from recipe_io import Recipe, iter_recipes, write_recipes
+
+# MinHash-LSH for fuzzy (reordered/extra words) duplicate matching (optional)
+try:
+    from datasketch import MinHash, MinHashLSH
+    DATASKETCH_AVAILABLE = True
+except ImportError:
+    DATASKETCH_AVAILABLE = False
+
+# Progress bar for the dedup loop (optional)
+try:
+    from tqdm import tqdm
+    TQDM_AVAILABLE = True
+except ImportError:
+    TQDM_AVAILABLE = False
+
+# Estimated Jaccard similarity of name+ingredient shingles to count as duplicate
+FUZZY_THRESHOLD = 0.75
+FUZZY_NUM_PERM = 64
+# Ingredients dominate the shingles, so LSH candidates must also share at
+# least this fraction (Jaccard) of their name words to be merged
+FUZZY_NAME_OVERLAP = 0.6
+
+# Minimum number of duplicate groups before scoring uses a process pool
+PARALLEL_MIN_GROUPS = 1000
 
 class RecipeDeduplicator:
     """Remove duplicate recipes from database."""
@@ -38,7 +68,6 @@ class RecipeDeduplicator:
     ]
     
     def __init__(self):
-        self.recipes = []
         self.groups = defaultdict(list)
         self.stats = {
             'original': 0,
@@ -49,93 +78,176 @@ class RecipeDeduplicator:
     
     def normalize_name(self, name: str) -> str:
         """Normalize recipe name for comparison."""
-        # Lowercase
-        normalized = name.lower().strip()
-        
-        # Remove ignore words
-        words = normalized.split()
-        words = [w for w in words if w not in self.IGNORE_WORDS]
-        normalized = ' '.join(words)
-        
-        # Remove special chars
-        normalized = re.sub(r'[^\w\s]', '', normalized)
-        
-        # Remove extra spaces
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        return normalized
+        return normalize_name(name)
     
-    def get_source_score(self, recipe: dict) -> int:
+    @classmethod
+    def get_source_score(cls, recipe: Recipe) -> int:
         """Get source priority score."""
-        source = recipe.get('source', '').split('(')[0].strip()
-        return self.SOURCE_PRIORITY.get(source, 0)
+        source = (recipe.source or '').split('(')[0].strip()
+        return cls.SOURCE_PRIORITY.get(source, 0)
     
-    def get_quality_score(self, recipe: dict) -> int:
+    @classmethod
+    def get_quality_score(cls, recipe: Recipe) -> int:
         """Calculate recipe quality score."""
-        score = 0
+        source = (recipe.source or '').split('(')[0].strip()
+        return (
+            cls.SOURCE_PRIORITY.get(source, 0)                    # Source priority
+            + (20 if recipe.image_url else 0)                     # Has image
+            + min(len(recipe.ingredients or ()), 20)              # More ingredients is better, up to 20
+            + min(len(recipe.instructions or ()), 15)             # More steps is better, up to 15
+            + (10 if recipe.description else 0)                   # Has description
+            + min(len(recipe.tags or ()), 10)                     # Has tags, up to 10
+        )
+    
+    def load_recipes(self, db_path: str):
+        """Stream recipes from database straight into their name groups."""
+        for data in iter_recipes(db_path):
+            recipe = Recipe.from_dict(data)
+            self.groups[self.normalize_name(recipe.name or '')].append(recipe)
+            self.stats['original'] += 1
+        print(f"📊 Loaded {self.stats['original']} recipes")
+    
+    def _shingles(self, recipe: Recipe) -> set:
+        """Name words and word pairs plus ingredient words, for fuzzy matching."""
+        tokens = self.normalize_name(recipe.name or '').split()
+        shingles = set(tokens)
+        shingles.update(' '.join(pair) for pair in zip(tokens, tokens[1:]))
+        for ingredient in (recipe.ingredients or ())[:10]:
+            shingles.update(w for w in self.normalize_name(ingredient).split() if w.isalpha())
+        return shingles
+    
+    def merge_fuzzy_groups(self):
+        """
+        Merge name groups that are near-duplicates, e.g. "Spicy Chicken Pasta"
+        vs "Chicken Pasta Spicy Style", using MinHash-LSH over each group's
+        name+ingredient shingles. Matching groups are joined with union-find.
         
-        # Source priority
-        score += self.get_source_score(recipe)
+        LSH candidates are only merged when their names also overlap
+        (name_overlap), so different dishes with the same ingredients stay apart.
+        """
+        keys = list(self.groups)
+        lsh = MinHashLSH(threshold=FUZZY_THRESHOLD, num_perm=FUZZY_NUM_PERM)
+        minhashes = []
+        for i, key in enumerate(keys):
+            m = MinHash(num_perm=FUZZY_NUM_PERM)
+            for shingle in self._shingles(self.groups[key][0]):
+                m.update(shingle.encode('utf-8'))
+            lsh.insert(i, m)
+            minhashes.append(m)
         
-        # Has image
-        if recipe.get('image_url'):
-            score += 20
+        self._merge_pairs(keys, (
+            (i, j)
+            for i, m in enumerate(minhashes)
+            for j in lsh.query(m)
+            if i != j and name_overlap(keys[i], keys[j]) >= FUZZY_NAME_OVERLAP
+        ))
+    
+    def merge_prefix_groups(self):
+        """
+        Merge name groups whose names differ only in plurals, e.g.
+        "chicken pasta" vs "chicken pastas". A one-letter edit that changes
+        a word ("chicken mandi" vs "chicken handi") is a different dish and
+        is never merged.
         
-        # Number of ingredients (more is better, up to 20)
-        score += min(len(recipe.get('ingredients', [])), 20)
+        Groups are keyed by dish_key, so this is a single pass with no
+        pairwise comparison and no optional edit-distance backend.
+        """
+        keys = list(self.groups)
+        first = {}
+        pairs = []
+        for i, key in enumerate(keys):
+            j = first.setdefault(dish_key(key), i)
+            if j != i:
+                pairs.append((j, i))
         
-        # Number of steps (more is better, up to 15)
-        score += min(len(recipe.get('instructions', [])), 15)
+        self._merge_pairs(keys, pairs)
+    
+    def _merge_pairs(self, keys: list, pairs):
+        """Join groups keys[i]/keys[j] for each (i, j) pair with union-find."""
+        # The earliest group becomes the root
+        parent = list(range(len(keys)))
         
-        # Has description
-        if recipe.get('description'):
-            score += 10
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
         
-        # Has tags
-        score += min(len(recipe.get('tags', [])), 10)
+        for i, j in pairs:
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
         
-        return score
+        merged = defaultdict(list)
+        for i, key in enumerate(keys):
+            merged[keys[find(i)]].extend(self.groups[key])
+        self.groups = merged
     
-    def load_recipes(self, db_path: str):
-        """Load recipes from database."""
-        with open(db_path, 'r', encoding='utf-8') as f:
-            self.recipes = json.load(f)
-        self.stats['original'] = len(self.recipes)
-        print(f"📊 Loaded {len(self.recipes)} recipes")
-    
-    def find_duplicates(self):
-        """Group recipes by normalized name."""
-        for recipe in self.recipes:
-            normalized = self.normalize_name(recipe['name'])
-            self.groups[normalized].append(recipe)
-        
-        # Count duplicates
+    def find_duplicates(self, fuzzy: bool = False, prefix: bool = False):
+        """Count duplicates in the groups built by load_recipes."""
+        if prefix:
+            self.merge_prefix_groups()
+        
+        if fuzzy:
+            if DATASKETCH_AVAILABLE:
+                self.merge_fuzzy_groups()
+            else:
+                print("⚠️ datasketch not available, using exact name matching. Install with: pip install datasketch")
+        
         for normalized, group in self.groups.items():
             if len(group) > 1:
                 self.stats['duplicates'] += len(group) - 1
         
         print(f"🔍 Found {self.stats['duplicates']} duplicate recipes")
     
-    def deduplicate(self) -> list:
-        """Remove duplicates, keeping best version."""
+    def print_duplicate_groups(self):
+        """List every group that deduplicate would collapse (before confirming)."""
+        report = []
+        for normalized, group in self.groups.items():
+            if len(group) > 1:
+                report.append(f"\n🔗 '{normalized}':")
+                report += [f"   - {recipe.name} ({recipe.id})" for recipe in group]
+        if report:
+            print('\n'.join(report))
+    
+    def deduplicate(self, workers: int = 1) -> list:
+        """
+        Remove duplicates, keeping best version.
+        
+        With workers > 1 and at least PARALLEL_MIN_GROUPS duplicate groups,
+        scoring is spread over a process pool; below that the pickling cost
+        outweighs the scoring work.
+        """
         deduplicated = []
         
-        for normalized, group in self.groups.items():
+        # Score all duplicate groups up front (possibly in parallel)
+        dup_groups = [(normalized, group) for normalized, group in self.groups.items() if len(group) > 1]
+        if workers > 1 and len(dup_groups) >= PARALLEL_MIN_GROUPS:
+            with Pool(workers) as pool:
+                group_scores = pool.imap(score_group, (group for _, group in dup_groups), chunksize=64)
+                scores_by_name = dict(zip((normalized for normalized, _ in dup_groups), group_scores))
+        else:
+            scores_by_name = {normalized: score_group(group) for normalized, group in dup_groups}
+        
+        # Per-group report is collected and written once after the loop
+        report = []
+        groups = self.groups.items()
+        if TQDM_AVAILABLE:
+            groups = tqdm(groups, desc='Deduplicating', unit='group')
+        
+        for normalized, group in groups:
             if len(group) == 1:
                 # No duplicates, keep it
                 deduplicated.append(group[0])
                 self.stats['kept'] += 1
             else:
                 # Duplicates found, keep best one
-                print(f"\n🔄 Deduplicating '{normalized}':")
+                report.append(f"\n🔄 Deduplicating '{normalized}':")
                 
-                # Score each recipe
-                scored = []
-                for recipe in group:
-                    score = self.get_quality_score(recipe)
-                    scored.append((score, recipe))
-                    print(f"   - {recipe['name']} ({recipe['id']})")
-                    print(f"     Source: {recipe.get('source', 'Unknown')}, Score: {score}")
+                scored = list(zip(scores_by_name[normalized], group))
+                for score, recipe in scored:
+                    report.append(f"   - {recipe.name} ({recipe.id})")
+                    report.append(f"     Source: {recipe.source or 'Unknown'}, Score: {score}")
                 
                 # Sort by score (highest first)
                 scored.sort(reverse=True, key=lambda x: x[0])
@@ -143,25 +255,33 @@ class RecipeDeduplicator:
                 # Keep the best
                 best = scored[0][1]
                 deduplicated.append(best)
-                print(f"   ✅ Keeping: {best['name']} (score: {scored[0][0]})")
-                print(f"   ❌ Removing: {len(scored) - 1} duplicates")
+                report.append(f"   ✅ Keeping: {best.name} (score: {scored[0][0]})")
+                report.append(f"   ❌ Removing: {len(scored) - 1} duplicates")
                 
                 self.stats['kept'] += 1
                 self.stats['removed'] += len(scored) - 1
         
+        if report:
+            print('\n'.join(report))
+        
         return deduplicated
     
-    def save_recipes(self, recipes: list, db_path: str):
-        """Save deduplicated recipes."""
-        # Backup original
-        backup_path = db_path.replace('.json', '.before_dedup.json')
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            json.dump(self.recipes, f, indent=2, ensure_ascii=False)
+    def save_recipes(self, recipes: list, db_path: str, pretty: bool = False):
+        """
+        Save deduplicated recipes.
+        
+        Written compact by default, which is faster to serialize and skips
+        the whitespace. pretty=True keeps the old indent=2 layout for
+        hand-editing.
+        """
+        # Backup original (gzipped copy; restore with gunzip)
+        backup_path = db_path.replace('.json', '.before_dedup.json.gz')
+        with open(db_path, 'rb') as src, gzip.open(backup_path, 'wb', compresslevel=3) as dst:
+            shutil.copyfileobj(src, dst)
         print(f"\n💾 Backup saved to: {backup_path}")
         
         # Save deduplicated
-        with open(db_path, 'w', encoding='utf-8') as f:
-            json.dump(recipes, f, indent=2, ensure_ascii=False)
+        write_recipes(db_path, [r.to_dict() for r in recipes], indent=pretty)
         print(f"✅ Saved {len(recipes)} deduplicated recipes")
     
     def print_stats(self):
@@ -176,8 +296,74 @@ class RecipeDeduplicator:
         print(f"  Reduction:         {self.stats['duplicates']} recipes ({self.stats['duplicates'] / self.stats['original'] * 100:.1f}%)")
 
 
+_IGNORE_WORDS = frozenset(RecipeDeduplicator.IGNORE_WORDS)
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_MULTI_SPACE_RE = re.compile(r'\s+')
+
+
+@functools.lru_cache(maxsize=100_000)
+def normalize_name(name: str) -> str:
+    """Normalize recipe name for comparison (cached, so repeated names are normalized once)."""
+    # Lowercase
+    normalized = name.lower().strip()
+    
+    # Remove ignore words
+    words = normalized.split()
+    words = [w for w in words if w not in _IGNORE_WORDS]
+    normalized = ' '.join(words)
+    
+    # Remove special chars
+    normalized = _NON_WORD_RE.sub('', normalized)
+    
+    # Remove extra spaces
+    normalized = _MULTI_SPACE_RE.sub(' ', normalized).strip()
+    
+    return normalized
+
+
+def name_overlap(a: str, b: str) -> float:
+    """Jaccard similarity of the words of two normalized names, 0.0 - 1.0."""
+    words_a, words_b = set(a.split()), set(b.split())
+    if not words_a or not words_b:
+        return 0.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+
+def _singular(word: str) -> str:
+    """Crude singular form of an English word ("berries" -> "berry", "pastas" -> "pasta")."""
+    if word.endswith('ies') and len(word) > 4:
+        return word[:-3] + 'y'
+    if word.endswith(('oes', 'ches', 'shes', 'sses', 'xes', 'zes')):
+        return word[:-2]
+    if word.endswith('s') and not word.endswith('ss') and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+def dish_key(name: str) -> str:
+    """
+    Normalized name with every word singular; --prefix merges names with equal keys.
+    
+    Normalization already drops punctuation and descriptor words, so plurals
+    are the only difference left to merge across.
+    """
+    return ' '.join(_singular(word) for word in name.split())
+
+
+def score_group(group: list) -> list:
+    """Quality score of each recipe in a group (module-level so Pool workers can pickle it)."""
+    return [RecipeDeduplicator.get_quality_score(recipe) for recipe in group]
+
+
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description='Remove duplicate recipes from the database')
+    parser.add_argument('--fuzzy', action='store_true', help='Also merge near-duplicate names (MinHash-LSH, needs datasketch)')
+    parser.add_argument('--prefix', action='store_true', help='Also merge names that differ only in plurals')
+    parser.add_argument('--pretty', action='store_true', help='Write the database indented (slower, larger)')
+    parser.add_argument('--workers', type=int, default=cpu_count(), help='Processes used to score large duplicate sets (default: CPU count)')
+    args = parser.parse_args()
+    
     script_dir = Path(__file__).parent
     db_path = script_dir / '..' / 'data' / 'recipes.json'
     
@@ -191,23 +377,24 @@ def main():
     dedup.load_recipes(str(db_path))
     
     # Find duplicates
-    dedup.find_duplicates()
+    dedup.find_duplicates(fuzzy=args.fuzzy, prefix=args.prefix)
     
     if dedup.stats['duplicates'] == 0:
         print("\n✅ No duplicates found! Database is clean.")
         return
     
-    # Confirm
+    # Show what would be merged, then confirm
+    dedup.print_duplicate_groups()
     response = input(f"\n⚠️  Remove {dedup.stats['duplicates']} duplicates? (y/N): ")
     if response.lower() != 'y':
         print("❌ Cancelled.")
         return
     
     # Deduplicate
-    deduplicated = dedup.deduplicate()
+    deduplicated = dedup.deduplicate(workers=args.workers)
     
     # Save
-    dedup.save_recipes(deduplicated, str(db_path))
+    dedup.save_recipes(deduplicated, str(db_path), pretty=args.pretty)
     
     # Stats
     dedup.print_stats()
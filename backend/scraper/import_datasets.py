@@ -6,119 +6,226 @@ Sources:
 2. Recipe1M dataset - Academic dataset with 1M+ recipes
 3. Food.com Kaggle dataset - 230k+ recipes
 """
-import json
 import requests
-import time
-from typing import List, Dict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Iterator, Optional, Tuple
 import os
+import sqlite3
+import threading
+
+from recipe_io import iter_recipes, append_recipes, write_recipes, loads
+
+# Progress bar for the detail lookups (optional)
+try:
+    from tqdm import tqdm
+    TQDM_AVAILABLE = True
+except ImportError:
+    TQDM_AVAILABLE = False
+
+# Concurrent TheMealDB detail lookups (the API is I/O bound, not CPU bound)
+MAX_WORKERS = 8
+THEMEALDB_URL = "https://www.themealdb.com/api/json/v1/1"
+
+# Meal detail responses cached across runs (meal_id -> ETag + JSON body)
+MEALDB_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'myfridge', 'mealdb.sqlite')
+
+# TheMealDB spreads ingredients over strIngredient1..20 / strMeasure1..20
+_ING_KEYS = tuple(f'strIngredient{i}' for i in range(1, 21))
+_MEA_KEYS = tuple(f'strMeasure{i}' for i in range(1, 21))
+
+
+class MealCache:
+    """
+    SQLite cache of TheMealDB lookup responses, shared by the fetch threads.
+    
+    Meals stored with an ETag are revalidated with If-None-Match; meals the
+    API sent without one are reused as-is (meal details rarely change).
+    """
+    
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meals(id TEXT PRIMARY KEY, etag TEXT, body BLOB)')
+        self.lock = threading.Lock()
+    
+    def get(self, meal_id: str) -> Optional[Tuple[Optional[str], bytes]]:
+        """Cached (etag, body) for a meal, or None."""
+        with self.lock:
+            return self.conn.execute('SELECT etag, body FROM meals WHERE id = ?', (meal_id,)).fetchone()
+    
+    def put(self, meal_id: str, etag: Optional[str], body: bytes):
+        """Store a meal's response body."""
+        with self.lock:
+            self.conn.execute('INSERT OR REPLACE INTO meals(id, etag, body) VALUES (?, ?, ?)', (meal_id, etag, body))
+    
+    def close(self):
+        self.conn.close()
+
 
 class DatasetImporter:
-    def __init__(self):
+    def __init__(self, cache_path: Optional[str] = MEALDB_CACHE_PATH):
         self.recipes = []
+        self.session = self._build_session()
+        self.cache = MealCache(cache_path) if cache_path else None
+    
+    def _build_session(self) -> requests.Session:
+        """Pooled keep-alive session with retries on transient errors."""
+        session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
     
-    def import_themealdb(self) -> List[Dict]:
+    def import_themealdb(self) -> Iterator[Dict]:
         """
         Import recipes from TheMealDB API (free, no key required).
         API Docs: https://www.themealdb.com/api.php
+        
+        Yields recipes as the detail lookups complete so callers can
+        stream them straight into the database.
         """
         print("\n🌐 Importing from TheMealDB API...")
-        recipes = []
         
         # Get all categories
-        categories_url = "https://www.themealdb.com/api/json/v1/1/categories.php"
+        categories_url = f"{THEMEALDB_URL}/categories.php"
         try:
-            response = requests.get(categories_url, timeout=10)
+            response = self.session.get(categories_url, timeout=10)
             categories = response.json().get('categories', [])
             
             print(f"Found {len(categories)} categories")
             
-            # For each category, get all meals
+            # For each category, collect the meal ids to look up
+            tasks = []
             for cat in categories[:5]:  # Start with first 5 categories
                 cat_name = cat['strCategory']
                 print(f"  📁 Fetching {cat_name} recipes...")
                 
-                meals_url = f"https://www.themealdb.com/api/json/v1/1/filter.php?c={cat_name}"
-                meals_response = requests.get(meals_url, timeout=10)
+                meals_url = f"{THEMEALDB_URL}/filter.php?c={cat_name}"
+                meals_response = self.session.get(meals_url, timeout=10)
                 meals = meals_response.json().get('meals', [])
                 
-                # Get detailed info for each meal
                 for meal in meals[:10]:  # Limit to 10 per category for now
-                    meal_id = meal['idMeal']
-                    detail_url = f"https://www.themealdb.com/api/json/v1/1/lookup.php?i={meal_id}"
-                    
-                    try:
-                        detail_response = requests.get(detail_url, timeout=10)
-                        meal_detail = detail_response.json().get('meals', [{}])[0]
-                        
-                        if not meal_detail:
-                            continue
-                        
-                        # Extract ingredients
-                        ingredients = []
-                        for i in range(1, 21):
-                            ing = meal_detail.get(f'strIngredient{i}', '').strip()
-                            measure = meal_detail.get(f'strMeasure{i}', '').strip()
-                            if ing:
-                                ingredients.append(f"{measure} {ing}".strip())
-                        
-                        # Parse instructions into steps
-                        instructions_text = meal_detail.get('strInstructions', '')
-                        steps = [s.strip() for s in instructions_text.split('\r\n') if s.strip()]
-                        if not steps:
-                            steps = [s.strip() for s in instructions_text.split('.') if s.strip()]
-                        
-                        # Determine category
-                        category = 'main'
-                        if 'dessert' in cat_name.lower():
-                            category = 'dessert'
-                        elif 'breakfast' in cat_name.lower():
-                            category = 'breakfast'
-                        elif 'side' in cat_name.lower():
-                            category = 'side'
-                        
-                        # Build recipe object
-                        recipe = {
-                            'id': f"themealdb_{meal_id}",
-                            'source': 'TheMealDB',
-                            'name': meal_detail.get('strMeal', 'Unknown'),
-                            'description': f"{meal_detail.get('strMeal', '')} from {meal_detail.get('strArea', 'Unknown')} cuisine",
-                            'prep_time': 10,  # Default estimates
-                            'cook_time': 30,
-                            'total_time': 40,
-                            'servings': 4,
-                            'difficulty': 'medium',
-                            'ingredients': ingredients,
-                            'instructions': steps[:15],  # Limit steps
-                            'tags': [cat_name.lower(), meal_detail.get('strArea', '').lower()],
-                            'cuisine': meal_detail.get('strArea', 'International'),
-                            'category': category,
-                            'image_url': meal_detail.get('strMealThumb', '')
-                        }
-                        
-                        recipes.append(recipe)
-                        print(f"    ✅ {recipe['name']}")
-                        time.sleep(0.5)  # Be nice to the API
-                        
-                    except Exception as e:
-                        print(f"    ⚠️ Error fetching meal {meal_id}: {e}")
-                        continue
-                
-                time.sleep(1)  # Pause between categories
-            
-            print(f"\n✅ Imported {len(recipes)} recipes from TheMealDB")
-            return recipes
+                    tasks.append((cat_name, meal['idMeal']))
             
         except Exception as e:
             print(f"❌ Error importing from TheMealDB: {e}")
-            return []
+            return
+        
+        # Get detailed info for each meal, MAX_WORKERS requests in flight
+        count = 0
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            results = executor.map(self._fetch_meal, tasks)
+            if TQDM_AVAILABLE:
+                results = tqdm(results, total=len(tasks), desc='TheMealDB', unit='meal')
+            for recipe in results:
+                if recipe:
+                    count += 1
+                    yield recipe
+        
+        print(f"\n✅ Imported {count} recipes from TheMealDB")
+    
+    def _fetch_meal(self, task: Tuple[str, str]) -> Optional[Dict]:
+        """Fetch one meal's details and convert it to our format."""
+        cat_name, meal_id = task
+        detail_url = f"{THEMEALDB_URL}/lookup.php?i={meal_id}"
+        
+        try:
+            body = self._get_meal_body(meal_id, detail_url)
+            meal_detail = (loads(body).get('meals') or [{}])[0]
+            
+            if not meal_detail:
+                return None
+            
+            return self._parse_meal(meal_detail, cat_name)
+            
+        except Exception as e:
+            print(f"    ⚠️ Error fetching meal {meal_id}: {e}")
+            return None
+    
+    def _get_meal_body(self, meal_id: str, detail_url: str) -> bytes:
+        """Raw lookup response for a meal, served from the cache when possible."""
+        cached = self.cache.get(meal_id) if self.cache else None
+        headers = {}
+        if cached:
+            etag, body = cached
+            if not etag:
+                return body
+            headers['If-None-Match'] = etag
+        
+        detail_response = self.session.get(detail_url, headers=headers, timeout=10)
+        if detail_response.status_code == 304:
+            return cached[1]
+        
+        detail_response.raise_for_status()
+        body = detail_response.content
+        if self.cache:
+            self.cache.put(meal_id, detail_response.headers.get('ETag'), body)
+        return body
+    
+    def _parse_meal(self, meal_detail: Dict, cat_name: str) -> Dict:
+        """Convert a TheMealDB meal into our recipe format."""
+        # Extract ingredients
+        # (unused slots come back as "" or null)
+        ingredients = []
+        for ing_key, mea_key in zip(_ING_KEYS, _MEA_KEYS):
+            ing = (meal_detail.get(ing_key) or '').strip()
+            if ing:
+                measure = (meal_detail.get(mea_key) or '').strip()
+                ingredients.append(f"{measure} {ing}".strip())
+        
+        # Parse instructions into steps
+        instructions_text = meal_detail.get('strInstructions', '')
+        steps = [s.strip() for s in instructions_text.split('\r\n') if s.strip()]
+        if not steps:
+            steps = [s.strip() for s in instructions_text.split('.') if s.strip()]
+        
+        # Determine category
+        category = 'main'
+        if 'dessert' in cat_name.lower():
+            category = 'dessert'
+        elif 'breakfast' in cat_name.lower():
+            category = 'breakfast'
+        elif 'side' in cat_name.lower():
+            category = 'side'
+        
+        # Build recipe object
+        recipe = {
+            'id': f"themealdb_{meal_detail.get('idMeal', '')}",
+            'source': 'TheMealDB',
+            'name': meal_detail.get('strMeal', 'Unknown'),
+            'description': f"{meal_detail.get('strMeal', '')} from {meal_detail.get('strArea', 'Unknown')} cuisine",
+            'prep_time': 10,  # Default estimates
+            'cook_time': 30,
+            'total_time': 40,
+            'servings': 4,
+            'difficulty': 'medium',
+            'ingredients': ingredients,
+            'instructions': steps[:15],  # Limit steps
+            'tags': [cat_name.lower(), meal_detail.get('strArea', '').lower()],
+            'cuisine': meal_detail.get('strArea', 'International'),
+            'category': category,
+            'image_url': meal_detail.get('strMealThumb', '')
+        }
+        
+        return recipe
     
     def save_recipes(self, output_file: str):
         """Save all recipes to JSON file."""
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.recipes, f, indent=2, ensure_ascii=False)
+        write_recipes(output_file, self.recipes)
         print(f"\n💾 Saved {len(self.recipes)} recipes to {output_file}")
 
 
+def _count_recipe(recipe: Dict, categories: Counter, cuisines: Counter, sources: Counter):
+    """Add a recipe to the summary counters."""
+    categories[recipe.get('category', 'unknown')] += 1
+    cuisines[recipe.get('cuisine', 'unknown')] += 1
+    sources[recipe.get('source', 'unknown')] += 1
+
+
 def main():
     """Main import function."""
     print("🍳 MyFridge Recipe Dataset Importer")
@@ -130,55 +237,50 @@ def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     data_path = os.path.join(script_dir, '..', 'data', 'recipes.json')
     
+    # Load existing recipe ids and summary counts in one streamed pass
+    # (the recipes themselves aren't kept)
+    existing_ids = set()
+    existing_count = 0
+    categories, cuisines, sources = Counter(), Counter(), Counter()
     try:
-        with open(data_path, 'r', encoding='utf-8') as f:
-            existing_recipes = json.load(f)
-        print(f"📊 Current database: {len(existing_recipes)} recipes")
+        for recipe in iter_recipes(data_path):
+            existing_ids.add(recipe['id'])
+            existing_count += 1
+            _count_recipe(recipe, categories, cuisines, sources)
+        print(f"📊 Current database: {existing_count} recipes")
     except FileNotFoundError:
-        existing_recipes = []
         print("📊 Starting with empty database")
     
-    # Import from TheMealDB
-    new_recipes = importer.import_themealdb()
-    
-    # Merge with existing (avoid duplicates)
-    existing_ids = {r['id'] for r in existing_recipes}
-    unique_new = [r for r in new_recipes if r['id'] not in existing_ids]
-    
-    all_recipes = existing_recipes + unique_new
+    # Import from TheMealDB, skipping recipes already in the database
+    unique_new = []
+    for recipe in importer.import_themealdb():
+        if recipe['id'] not in existing_ids:
+            existing_ids.add(recipe['id'])
+            unique_new.append(recipe)
+            _count_recipe(recipe, categories, cuisines, sources)
     
     print(f"\n📈 Added {len(unique_new)} new recipes")
-    print(f"📊 Total recipes: {len(all_recipes)}")
+    print(f"📊 Total recipes: {existing_count + len(unique_new)}")
     
-    # Save
-    with open(data_path, 'w', encoding='utf-8') as f:
-        json.dump(all_recipes, f, indent=2, ensure_ascii=False)
+    if importer.cache:
+        importer.cache.close()
     
-    print(f"\n✅ Database updated successfully!")
+    # Save (appends to the database, existing recipes aren't rewritten)
+    append_recipes(data_path, unique_new)
     
-    # Summary
-    categories = {}
-    cuisines = {}
-    sources = {}
-    
-    for recipe in all_recipes:
-        cat = recipe.get('category', 'unknown')
-        categories[cat] = categories.get(cat, 0) + 1
-        cui = recipe.get('cuisine', 'unknown')
-        cuisines[cui] = cuisines.get(cui, 0) + 1
-        src = recipe.get('source', 'unknown')
-        sources[src] = sources.get(src, 0) + 1
+    print(f"\n✅ Database updated successfully!")
     
+    # Summary (counts were updated while loading/importing)
     print("\n📂 By category:")
-    for cat, count in sorted(categories.items(), key=lambda x: -x[1])[:10]:
+    for cat, count in categories.most_common(10):
         print(f"  - {cat}: {count}")
     
     print("\n🌍 By cuisine:")
-    for cui, count in sorted(cuisines.items(), key=lambda x: -x[1])[:10]:
+    for cui, count in cuisines.most_common(10):
         print(f"  - {cui}: {count}")
     
     print("\n📚 By source:")
-    for src, count in sorted(sources.items(), key=lambda x: -x[1]):
+    for src, count in sources.most_common():
         print(f"  - {src}: {count}")
     
     print("\n💡 Next steps to reach 1000s of recipes:")
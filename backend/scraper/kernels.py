@@ -0,0 +1,50 @@
+"""
+Popularity Scoring Kernels
+==========================
+
+Numba-compiled kernels for real_popularity_system.py.
+
+score_kernel computes the quality score and the weighted popularity sum
+for every recipe in one compiled loop (parallel over recipes). It is only
+defined when numba is installed; callers check NUMBA_AVAILABLE and fall
+back to the NumPy version otherwise.
+"""
+
+try:
+    import numpy as np
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    # No fastmath: the sum must stay in the same order as the Python
+    # version so scores round the same way
+    @njit(parallel=True, cache=True)
+    def score_kernel(desc_len, tags_len, has_image, instr_len, has_time, ing_len,
+                     trends, engagement, recency, out):
+        """Popularity score per recipe into out (same rules as RealPopularityScorer)."""
+        for i in prange(out.shape[0]):
+            quality = 0
+            if desc_len[i] > 20:
+                quality += 15
+            if tags_len[i] > 0:
+                quality += 15
+            if has_image[i]:
+                quality += 20
+            if instr_len[i] >= 3:
+                quality += 25
+            if has_time[i]:
+                quality += 15
+            if 3 <= ing_len[i] <= 15:
+                quality += 10
+            if quality > 100:
+                quality = 100
+            out[i] = trends[i] * 0.40 + engagement[i] * 0.30 + quality * 0.20 + recency[i] * 0.10
+
+    # Compile once at import (cached on disk) so the first real call doesn't pay for it
+    _ints = np.zeros(1, dtype=np.int32)
+    _flags = np.zeros(1, dtype=np.bool_)
+    _floats = np.zeros(1, dtype=np.float64)
+    score_kernel(_ints, _ints, _flags, _ints, _flags, _ints, _floats, _floats, _floats, np.empty(1))
@@ -17,29 +17,129 @@ Sources used:
 - These are explicitly shared for research/educational use
 """
 
+import asyncio
+import hashlib
 import json
 import os
-from typing import Dict, List
+import random
+import re
+import sqlite3
+from collections import OrderedDict
+from typing import Dict, List, Optional
 import time
 
 # Try to import Groq for AI rewriting
 try:
-    from groq import Groq
+    from groq import Groq, RateLimitError, APITimeoutError, APIConnectionError
     GROQ_AVAILABLE = True
+    RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, TimeoutError)
 except ImportError:
     GROQ_AVAILABLE = False
+    RETRYABLE_ERRORS = (TimeoutError,)
     print("⚠️ Groq not available. Install with: pip install groq")
 
+GROQ_MODEL = "llama-3.1-8b-instant"
+SYSTEM_PROMPT = "You are a creative recipe writer. Generate original, engaging recipe content."
+
+# Multi-pattern matcher for cooking verbs (optional, falls back to a regex)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Fast cache-key serialization (optional, falls back to json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Recipes per batched Groq call (small models get unreliable past ~12-16)
+MAX_BATCH_SIZE = 12
+BATCH_TOKENS_PER_RECIPE = 300
+
+# Concurrent Groq requests for bulk imports, and retries on rate limits/timeouts
+MAX_CONCURRENCY = 10
+MAX_RETRIES = 3
+
+# Groq responses/generated content cached across runs
+LLM_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'myfridge', 'llm_cache.sqlite')
+LLM_CACHE_MEMORY_SIZE = 1024
+TEMPERATURE = 0.8  # Higher temperature = more creative
+
+
+class LLMCache:
+    """
+    Cache of Groq output: SQLite (WAL) on disk with a small in-memory LRU.
+    
+    Keys are SHA-256 digests of
+    either the full request (request_key) or a recipe's normalized facts
+    (facts_key) so identical recipes reuse the same generated content.
+    """
+    
+    def __init__(self, path: str = LLM_CACHE_PATH, memory_size: int = LLM_CACHE_MEMORY_SIZE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS llm_cache(key TEXT PRIMARY KEY, value TEXT)')
+        self.memory = OrderedDict()
+        self.memory_size = memory_size
+    
+    @staticmethod
+    def digest(payload: Dict) -> str:
+        """Stable hex digest of a JSON-serializable payload."""
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        else:
+            # Same bytes orjson produces, so keys don't depend on which is installed
+            data = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        # Always SHA-256, so keys don't depend on what's installed either
+        return hashlib.sha256(data).hexdigest()
+    
+    @classmethod
+    def request_key(cls, model: str, messages: List[Dict], temperature: float) -> str:
+        return cls.digest({'model': model, 'messages': messages, 'temperature': round(temperature, 2)})
+    
+    @classmethod
+    def facts_key(cls, facts: Dict) -> str:
+        return cls.digest({'name': facts['name'].lower(), 'ingredients': sorted(facts['ingredients'])})
+    
+    def get(self, key: str) -> Optional[Dict]:
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key]
+        row = self.conn.execute('SELECT value FROM llm_cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        value = json.loads(row[0])
+        self._remember(key, value)
+        return value
+    
+    def set(self, key: str, value: Dict):
+        self.conn.execute('INSERT OR REPLACE INTO llm_cache(key, value) VALUES (?, ?)', (key, json.dumps(value)))
+        self._remember(key, value)
+    
+    def _remember(self, key: str, value: Dict):
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+
 class LegalRecipeImporter:
     """
     Imports recipe facts and generates original content using AI.
     """
     
-    def __init__(self, groq_api_key: str = None):
-        """Initialize with optional Groq API key."""
+    def __init__(self, groq_api_key: str = None, cache_path: Optional[str] = LLM_CACHE_PATH):
+        """Initialize with optional Groq API key (cache_path=None disables the LLM cache)."""
         self.groq_client = None
+        self.cache = None
         if groq_api_key and GROQ_AVAILABLE:
             self.groq_client = Groq(api_key=groq_api_key)
+            if cache_path:
+                self.cache = LLMCache(cache_path)
     
     def extract_facts(self, raw_recipe: Dict) -> Dict:
         """
@@ -66,13 +166,8 @@ class LegalRecipeImporter:
     
     def _clean_ingredients(self, ingredients: List[str]) -> List[str]:
         """Clean ingredient list (these are facts, not creative content)."""
-        cleaned = []
-        for ing in ingredients:
-            # Just clean up, don't modify
-            ing = ing.strip()
-            if ing:
-                cleaned.append(ing)
-        return cleaned
+        # Just clean up, don't modify
+        return [ing for ing in (i.strip() for i in ingredients) if ing]
     
     def _extract_basic_methods(self, steps: List[str]) -> List[str]:
         """
@@ -81,20 +176,10 @@ class LegalRecipeImporter:
         """
         basic_methods = []
         
-        # Common cooking verbs (these describe methods, not copyrightable)
-        method_verbs = [
-            'heat', 'cook', 'bake', 'boil', 'simmer', 'fry', 'sauté',
-            'mix', 'whisk', 'stir', 'blend', 'chop', 'dice', 'slice',
-            'add', 'pour', 'season', 'serve', 'garnish', 'combine'
-        ]
-        
         for step in steps:
             # Extract the core method/action
-            step_lower = step.lower()
-            for verb in method_verbs:
-                if verb in step_lower:
-                    basic_methods.append(step.strip())
-                    break
+            if _has_method_verb(step.lower()):
+                basic_methods.append(step.strip())
         
         return basic_methods[:10]  # Keep it concise
     
@@ -113,14 +198,14 @@ class LegalRecipeImporter:
             # Fallback: create simple content without AI
             return self._create_simple_content(facts)
         
+        cached = self._cached_content(facts)
+        if cached:
+            return cached
+        
         prompt = f"""You are a recipe writer. Given these FACTS about a recipe, write ORIGINAL content.
 
 FACTS (not copyrighted):
-- Name: {facts['name']}
-- Ingredients: {', '.join(facts['ingredients'][:10])}
-- Basic methods: {', '.join(facts['basic_steps'][:5])}
-- Time: {facts['cook_time']} minutes
-- Servings: {facts['servings']}
+{self._format_facts(facts)}
 
 Write:
 1. An ORIGINAL, appetizing description (2-3 sentences)
@@ -134,23 +219,12 @@ Format as JSON:
 }}"""
 
         try:
-            response = self.groq_client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=[
-                    {"role": "system", "content": "You are a creative recipe writer. Generate original, engaging recipe content."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.8,  # Higher temperature = more creative
-                max_tokens=1000,
-            )
-            
-            result_text = response.choices[0].message.content.strip()
+            result_text = (await self._complete(prompt, max_tokens=1000)).strip()
             
             # Try to parse JSON
-            import re
-            json_match = re.search(r'\{[\s\S]*\}', result_text)
-            if json_match:
-                result = json.loads(json_match.group(0))
+            result = _extract_json(result_text, '{')
+            if result:
+                self._cache_content(facts, result)
                 return result
             else:
                 return self._create_simple_content(facts)
@@ -159,16 +233,147 @@ Format as JSON:
             print(f"⚠️ AI generation failed: {e}")
             return self._create_simple_content(facts)
     
+    async def _complete(self, prompt: str, max_tokens: int) -> str:
+        """
+        Text of a Groq chat completion with our system prompt.
+        
+        Runs the blocking client in a worker thread so several requests can
+        be in flight, retrying rate limits/timeouts with exponential backoff.
+        Identical requests are answered from the LLM cache.
+        """
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+        key = LLMCache.request_key(GROQ_MODEL, messages, TEMPERATURE) if self.cache else None
+        if key:
+            cached = self.cache.get(key)
+            if cached:
+                return cached['content']
+        
+        for attempt in range(MAX_RETRIES):
+            try:
+                response = await asyncio.to_thread(
+                    self.groq_client.chat.completions.create,
+                    model=GROQ_MODEL,
+                    messages=messages,
+                    temperature=TEMPERATURE,
+                    max_tokens=max_tokens,
+                )
+                break
+            except RETRYABLE_ERRORS:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                await asyncio.sleep(2 ** attempt + random.random())
+        
+        content = response.choices[0].message.content
+        if key:
+            self.cache.set(key, {'content': content})
+        return content
+    
+    def _cached_content(self, facts: Dict) -> Optional[Dict]:
+        """Previously generated content for the same recipe facts, if any."""
+        return self.cache.get(LLMCache.facts_key(facts)) if self.cache else None
+    
+    def _cache_content(self, facts: Dict, content: Dict):
+        if self.cache:
+            self.cache.set(LLMCache.facts_key(facts), content)
+    
+    async def generate_original_content_batch(self, facts_list: List[Dict], batch_size: int = MAX_BATCH_SIZE,
+                                              max_concurrency: int = MAX_CONCURRENCY) -> List[Dict]:
+        """
+        Generate original content for many recipes, several per Groq call.
+        
+        Each call shares one system prompt across up to batch_size recipes
+        (capped at MAX_BATCH_SIZE) and asks for a JSON array back; up to
+        max_concurrency calls run at once.
+        Returns one content dict per facts dict, in the same order.
+        """
+        if not self.groq_client:
+            return [self._create_simple_content(facts) for facts in facts_list]
+        
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(batch):
+            async with semaphore:
+                return await self._generate_batch(batch)
+        
+        # Only recipes without cached content go to Groq, and repeats of
+        # the same facts in this run are generated once
+        contents = [self._cached_content(facts) for facts in facts_list]
+        missing = {}
+        for i, content in enumerate(contents):
+            if content is None:
+                missing.setdefault(LLMCache.facts_key(facts_list[i]), []).append(i)
+        todo = [indices[0] for indices in missing.values()]
+        
+        batches = [todo[start:start + batch_size] for start in range(0, len(todo), batch_size)]
+        results = await asyncio.gather(*(run([facts_list[i] for i in batch]) for batch in batches))
+        by_first = {}
+        for batch, batch_results in zip(batches, results):
+            by_first.update(zip(batch, batch_results))
+        for indices in missing.values():
+            for i in indices:
+                contents[i] = by_first[indices[0]]
+        return contents
+    
+    async def _generate_batch(self, batch: List[Dict]) -> List[Dict]:
+        """One batched Groq call; halves the batch and retries if the reply doesn't parse."""
+        if len(batch) == 1:
+            return [await self.generate_original_content(batch[0])]
+        
+        recipes_text = '\n\n'.join(
+            f"Recipe {i}:\n{self._format_facts(facts)}" for i, facts in enumerate(batch, 1)
+        )
+        prompt = f"""You are a recipe writer. Given these FACTS about {len(batch)} recipes, write ORIGINAL content for each.
+
+FACTS (not copyrighted):
+{recipes_text}
+
+For each recipe write:
+1. An ORIGINAL, appetizing description (2-3 sentences)
+2. ORIGINAL step-by-step instructions (detailed, student-friendly)
+
+Use a friendly, encouraging tone. Make cooking feel accessible.
+Format as a JSON array with one object per recipe, in the same order:
+[
+  {{"description": "...", "instructions": ["Step 1...", "Step 2...", ...]}},
+  ...
+]"""
+
+        try:
+            result_text = (await self._complete(prompt, max_tokens=BATCH_TOKENS_PER_RECIPE * len(batch))).strip()
+        except Exception as e:
+            print(f"⚠️ AI generation failed: {e}")
+            return [self._create_simple_content(facts) for facts in batch]
+        
+        results = _extract_json(result_text, '[')
+        
+        if (isinstance(results, list) and len(results) == len(batch)
+                and all(isinstance(r, dict) and 'description' in r and 'instructions' in r for r in results)):
+            for facts, content in zip(batch, results):
+                self._cache_content(facts, content)
+            return results
+        
+        # Bad or short reply: bisect so one confusing recipe doesn't sink the rest
+        mid = len(batch) // 2
+        return await self._generate_batch(batch[:mid]) + await self._generate_batch(batch[mid:])
+    
+    def _format_facts(self, facts: Dict) -> str:
+        """Facts block used in the generation prompts."""
+        return f"""- Name: {facts['name']}
+- Ingredients: {', '.join(facts['ingredients'][:10])}
+- Basic methods: {', '.join(facts['basic_steps'][:5])}
+- Time: {facts['cook_time']} minutes
+- Servings: {facts['servings']}"""
+    
     def _create_simple_content(self, facts: Dict) -> Dict:
         """Fallback: create simple original content without AI."""
         description = f"A delicious {facts['cuisine']} recipe with {', '.join(facts['ingredients'][:3])} and more. Ready in {facts['cook_time']} minutes!"
         
-        instructions = []
-        instructions.append(f"Gather all ingredients: {', '.join(facts['ingredients'][:5])}.")
-        
-        for i, method in enumerate(facts['basic_steps'][:5], 1):
-            instructions.append(f"{method.capitalize()}.")
-        
+        instructions = [f"Gather all ingredients: {', '.join(facts['ingredients'][:5])}."]
+        instructions += [f"{method.capitalize()}." for method in facts['basic_steps'][:5]]
         instructions.append(f"Serve immediately. Serves {facts['servings']}.")
         
         return {
@@ -185,16 +390,34 @@ Format as JSON:
         # Extract facts
         facts = self.extract_facts(raw_recipe)
         
-        # Generate original content
+        # Generate original content (one Groq call; use
+        # bulk_create_legal_recipes for many recipes)
         if use_ai:
-            # Note: This would need to be async in real usage
-            original_content = self._create_simple_content(facts)
+            original_content = asyncio.run(self.generate_original_content(facts))
         else:
             original_content = self._create_simple_content(facts)
         
-        # Combine into final recipe
+        return self._build_recipe(raw_recipe, facts, original_content)
+    
+    async def bulk_create_legal_recipes(self, raw_recipes: List[Dict],
+                                        max_concurrency: int = MAX_CONCURRENCY) -> List[Dict]:
+        """
+        Async version of create_legal_recipe for many recipes at once.
+        
+        Content comes from batched Groq calls, max_concurrency at a time
+        (simple content without a Groq client).
+        """
+        facts_list = [self.extract_facts(raw_recipe) for raw_recipe in raw_recipes]
+        contents = await self.generate_original_content_batch(facts_list, max_concurrency=max_concurrency)
+        return [
+            self._build_recipe(raw_recipe, facts, content)
+            for raw_recipe, facts, content in zip(raw_recipes, facts_list, contents)
+        ]
+    
+    def _build_recipe(self, raw_recipe: Dict, facts: Dict, original_content: Dict) -> Dict:
+        """Combine facts and original content into the final recipe."""
         recipe = {
-            'id': raw_recipe.get('id', f"recipe_{hash(facts['name'])}"),
+            'id': raw_recipe.get('id') or _recipe_id(facts['name']),
             'source': f"{raw_recipe.get('source', 'Curated')} (facts), MyFridge (content)",
             'name': facts['name'],
             'description': original_content['description'],
@@ -226,6 +449,60 @@ Format as JSON:
             return 'hard'
 
 
+def _recipe_id(name: str) -> str:
+    """
+    Stable id for a recipe without one: a 64-bit digest of its name
+    (built-in hash() is salted per process, so ids changed every run).
+    
+    Always blake2b from the stdlib: the ids are saved in recipes.json, so
+    they must not depend on which optional packages are installed.
+    """
+    return f"recipe_{hashlib.blake2b(name.encode('utf-8'), digest_size=8).hexdigest()}"
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json(text: str, openers: str = '{['):
+    """
+    First JSON value in an LLM reply that starts with one of openers.
+    
+    Decodes from each candidate position with raw_decode, which stops at
+    the end of the value (linear, no regex backtracking, and trailing
+    prose after the JSON is ignored). Returns None if nothing parses.
+    """
+    start = min((i for i in (text.find(c) for c in openers) if i != -1), default=-1)
+    while start != -1:
+        try:
+            return _JSON_DECODER.raw_decode(text, start)[0]
+        except json.JSONDecodeError:
+            start = min((i for i in (text.find(c, start + 1) for c in openers) if i != -1), default=-1)
+    return None
+
+
+# Common cooking verbs (these describe methods, not copyrightable)
+METHOD_VERBS = frozenset({
+    'heat', 'cook', 'bake', 'boil', 'simmer', 'fry', 'sauté',
+    'mix', 'whisk', 'stir', 'blend', 'chop', 'dice', 'slice',
+    'add', 'pour', 'season', 'serve', 'garnish', 'combine'
+})
+
+# Built once: each step is scanned a single time whatever the verb count
+if AHOCORASICK_AVAILABLE:
+    _METHOD_AUTOMATON = ahocorasick.Automaton()
+    for _verb in sorted(METHOD_VERBS):
+        _METHOD_AUTOMATON.add_word(_verb, _verb)
+    _METHOD_AUTOMATON.make_automaton()
+    
+    def _has_method_verb(text: str) -> bool:
+        return next(_METHOD_AUTOMATON.iter(text), None) is not None
+else:
+    _METHOD_RE = re.compile('|'.join(map(re.escape, sorted(METHOD_VERBS))))
+    
+    def _has_method_verb(text: str) -> bool:
+        return _METHOD_RE.search(text) is not None
+
+
 def example_usage():
     """Example of how to use this importer."""
     
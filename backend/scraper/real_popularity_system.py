@@ -16,9 +16,13 @@ Score components:
 Update frequency: Weekly/monthly automated refresh
 """
 
+import asyncio
+import hashlib
 import json
 import os
+from contextlib import nullcontext
 from pathlib import Path
+from types import MappingProxyType
 from datetime import datetime, timedelta
 import time
 import warnings
@@ -36,50 +40,144 @@ except ImportError:
     PYTRENDS_AVAILABLE = False
     print("⚠️  pytrends not installed. Run: pip install pytrends")
 
+# Vectorized quality scoring (optional, falls back to per-recipe scoring)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from recipe_io import iter_recipes, write_recipes
+
+# Compiled scoring kernel (optional, needs numba)
+from kernels import NUMBA_AVAILABLE
+if NUMBA_AVAILABLE:
+    from kernels import score_kernel
+
 try:
     import requests
+    import requests_cache
     from requests_cache import CachedSession
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
     print("⚠️  requests not installed. Run: pip install requests requests-cache")
 
+# Async Google Trends client (optional, preferred over pytrends)
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    from aiolimiter import AsyncLimiter
+    AIOLIMITER_AVAILABLE = True
+except ImportError:
+    AIOLIMITER_AVAILABLE = False
+
+# Token-bucket pacing for the synchronous pytrends path (optional)
+try:
+    from ratelimit import limits, sleep_and_retry
+    RATELIMIT_AVAILABLE = True
+except ImportError:
+    RATELIMIT_AVAILABLE = False
+
+TRENDS_HOME_URL = 'https://trends.google.com/?geo=US'
+TRENDS_EXPLORE_URL = 'https://trends.google.com/trends/api/explore'
+TRENDS_MULTILINE_URL = 'https://trends.google.com/trends/api/widgetdata/multiline'
+TRENDS_MAX_CONCURRENCY = 5
+TRENDS_REQUESTS_PER_MINUTE = 60
+TRENDS_PACE_LOG_EVERY = 20  # payloads between pacing log lines
+
+# Google Trends HTTP responses are cached for a week, so weekly re-runs are cheap
+TRENDS_CACHE_NAME = 'trends_cache'
+TRENDS_CACHE_EXPIRE = 7 * 86400
+
+# pytrends accepts up to 5 keywords per payload
+TRENDS_TERMS_PER_PAYLOAD = 5
+# Below this 90-day interest the 5-year baseline isn't fetched (score = recent only)
+TRENDS_MIN_RECENT_INTEREST = 1
+
+# Scores younger than this are kept unless the recipe's scored fields changed
+REFRESH_TTL = timedelta(days=7)
+SCORE_INPUT_FIELDS = ('name', 'description', 'tags', 'image', 'image_url', 'instructions',
+                      'total_time', 'prep_time', 'cook_time', 'ingredients')
+
+# Save progress to disk every N scored recipes
+CHECKPOINT_EVERY = 25
+
+
+def normalize_name(recipe_name):
+    """Lowercased, stripped recipe name used for alias/trends lookups."""
+    return recipe_name.lower().strip()
+
+
+# Common food aliases: main term -> alternative names
+# TODO: Build comprehensive alias database
+_ALIAS_RAW = {
+    "pad thai": ("thai noodles", "phad thai", "phat thai"),
+    "scrambled eggs": ("scrambled egg", "eggs scrambled"),
+    "fried rice": ("chinese fried rice", "egg fried rice"),
+    "pizza": ("pizza margherita", "cheese pizza"),
+    "pasta": ("spaghetti", "fettuccine", "penne"),
+    "tacos": ("taco", "mexican tacos"),
+    "curry": ("indian curry", "thai curry", "chicken curry"),
+    "burger": ("hamburger", "cheeseburger"),
+    "salad": ("green salad", "mixed salad"),
+    "soup": ("vegetable soup", "chicken soup"),
+}
+
+
+def _build_alias_index(aliases):
+    """Reverse index: main term or alias -> main term."""
+    index = {}
+    for main_term, alternatives in aliases.items():
+        index[main_term] = main_term
+        for alias in alternatives:
+            index.setdefault(alias, main_term)
+    return index
+
+
+# Built once at import and read-only, so every instance (and thread) shares it
+_ALIAS_INDEX = MappingProxyType(_build_alias_index(_ALIAS_RAW))
+
 
 class FoodAliasDatabase:
     """Manages food name aliases for better matching."""
     
     def __init__(self):
-        self.aliases = {}
         self.load_aliases()
     
     def load_aliases(self):
-        """Load or create food alias database."""
-        # TODO: Build comprehensive alias database
-        # For now, start with common aliases
-        self.aliases = {
-            "pad thai": ["thai noodles", "phad thai", "phat thai"],
-            "scrambled eggs": ["scrambled egg", "eggs scrambled"],
-            "fried rice": ["chinese fried rice", "egg fried rice"],
-            "pizza": ["pizza margherita", "cheese pizza"],
-            "pasta": ["spaghetti", "fettuccine", "penne"],
-            "tacos": ["taco", "mexican tacos"],
-            "curry": ["indian curry", "thai curry", "chicken curry"],
-            "burger": ["hamburger", "cheeseburger"],
-            "salad": ["green salad", "mixed salad"],
-            "soup": ["vegetable soup", "chicken soup"],
-        }
+        """Load the food alias database (shared module-level tables)."""
+        self.aliases = _ALIAS_RAW
+        self._index = _ALIAS_INDEX
     
-    def get_search_terms(self, recipe_name):
-        """Get all search terms for a recipe (name + aliases)."""
-        name_lower = recipe_name.lower().strip()
+    def canonicalize(self, recipe_name, normalized=False):
+        """
+        Main alias term for a recipe name, or the lowercased name if none
+        matches. Pass normalized=True if the name is already normalize_name()d.
+        """
+        name_lower = recipe_name if normalized else normalize_name(recipe_name)
+        
+        # Exact main term/alias: one hash probe
+        main_term = self._index.get(name_lower)
+        if main_term:
+            return main_term
         
-        # Check if this name has aliases
-        for main_term, aliases in self.aliases.items():
-            if main_term in name_lower or name_lower in aliases:
-                return [main_term] + aliases
+        # Names containing a main term, e.g. "chicken pasta" -> "pasta"
+        for main_term in self.aliases:
+            if main_term in name_lower:
+                return main_term
         
         # No aliases, use the recipe name
-        return [name_lower]
+        return name_lower
+    
+    def get_search_terms(self, recipe_name):
+        """Get all search terms for a recipe (name + aliases)."""
+        main_term = self.canonicalize(recipe_name)
+        return [main_term, *self.aliases.get(main_term, ())]
 
 
 class GoogleTrendsCollector:
@@ -90,53 +188,218 @@ class GoogleTrendsCollector:
             self.pytrends = TrendReq(hl='en-US', tz=360)
         else:
             self.pytrends = None
+        
+        # aiohttp client preferred, pytrends as the synchronous fallback
+        self.available = AIOHTTP_AVAILABLE or self.pytrends is not None
+        
+        # Scores by canonical term, so aliases of one dish are fetched once
+        self.scores = {}
+        
+        # Each payload is two HTTP requests (explore + data); only stall
+        # when the bucket is empty instead of sleeping after every fetch
+        self.payload_count = 0
+        self.started = time.monotonic()
+        if RATELIMIT_AVAILABLE:
+            self._fetch_payload = sleep_and_retry(
+                limits(calls=TRENDS_REQUESTS_PER_MINUTE // 2, period=60)(self._fetch_payload))
+    
+    def _fetch_payload(self, terms, timeframe):
+        """One pytrends payload: interest over time for up to 5 terms."""
+        self.pytrends.build_payload(terms, timeframe=timeframe)
+        interest = self.pytrends.interest_over_time()
+        
+        self.payload_count += 1
+        if self.payload_count % TRENDS_PACE_LOG_EVERY == 0:
+            elapsed = time.monotonic() - self.started
+            print(f"⏱️  Trends pace: {self.payload_count} payloads in {elapsed:.0f}s "
+                  f"({self.payload_count / elapsed * 60:.1f}/min)")
+        return interest
+    
+    def _http_cache(self):
+        """Persistent HTTP cache for the requests pytrends makes."""
+        if REQUESTS_AVAILABLE:
+            return requests_cache.enabled(TRENDS_CACHE_NAME, expire_after=TRENDS_CACHE_EXPIRE)
+        return nullcontext()
     
     def get_interest_score(self, recipe_name, alias_db):
         """Get Google Trends interest score (0-100)."""
-        if not self.pytrends:
+        if not self.available:
             return 50  # Default if API not available
         
+        primary_term = alias_db.canonicalize(recipe_name)
+        if primary_term not in self.scores:
+            self._fetch_pending([primary_term])
+        return self.scores.get(primary_term, 50)  # Default on error
+    
+    def _fetch_pending(self, terms):
+        """Fetch scores for terms into self.scores, TRENDS_TERMS_PER_PAYLOAD per request."""
+        chunks = [terms[start:start + TRENDS_TERMS_PER_PAYLOAD]
+                  for start in range(0, len(terms), TRENDS_TERMS_PER_PAYLOAD)]
+        
+        if AIOHTTP_AVAILABLE:
+            for scores in asyncio.run(self.batch_get_trends_async(chunks)):
+                self.scores.update(scores)
+            return
+        
+        for i, chunk in enumerate(chunks):
+            print(f"📊 Fetching trends: {i * TRENDS_TERMS_PER_PAYLOAD + len(chunk)}/{len(terms)} - {', '.join(chunk)}")
+            self.scores.update(self._fetch_interest_scores(chunk, ', '.join(chunk)))
+    
+    def _fetch_interest_scores(self, terms, label):
+        """
+        Fetch trends scores for up to TRENDS_TERMS_PER_PAYLOAD search terms
+        with one 90-day and one 5-year pytrends payload ({} on error).
+        The 5-year payload is skipped when none of the terms has recent interest.
+        """
         try:
-            search_terms = alias_db.get_search_terms(recipe_name)
-            primary_term = search_terms[0]
-            
-            # Get 90-day trend
-            timeframe_90d = 'today 3-m'
-            self.pytrends.build_payload([primary_term], timeframe=timeframe_90d)
-            interest_90d = self.pytrends.interest_over_time()
+            with self._http_cache():
+                # Get 90-day trend
+                interest_90d = self._fetch_payload(terms, 'today 3-m')
+                recent = {term: [] if interest_90d.empty else list(interest_90d[term]) for term in terms}
+                
+                # Get 5-year baseline
+                baseline = {}
+                if _has_recent_interest(recent):
+                    interest_5y = self._fetch_payload(terms, 'today 5-y')
+                    if not interest_5y.empty:
+                        baseline = {term: list(interest_5y[term]) for term in terms}
             
-            # Get 5-year baseline
-            timeframe_5y = 'today 5-y'
-            self.pytrends.build_payload([primary_term], timeframe=timeframe_5y)
-            interest_5y = self.pytrends.interest_over_time()
+            scores = {term: _trend_score(recent[term], baseline.get(term, [])) for term in terms}
             
-            # Calculate scores
-            recent_avg = interest_90d[primary_term].mean() if not interest_90d.empty else 0
-            baseline_avg = interest_5y[primary_term].mean() if not interest_5y.empty else 0
+            # Rate limiting (fixed pause without the token bucket)
+            if not RATELIMIT_AVAILABLE:
+                time.sleep(1)  # Google Trends rate limits
             
-            # Weighted score: 60% recent, 40% baseline
-            score = (recent_avg * 0.6) + (baseline_avg * 0.4)
+            return scores
             
-            # Rate limiting
-            time.sleep(1)  # Google Trends rate limits
+        except Exception as e:
+            print(f"❌ Google Trends error for '{label}': {e}")
+            return {}
+    
+    async def batch_get_trends_async(self, chunks):
+        """
+        Fetch scores for chunks of terms concurrently over aiohttp.
+        
+        Up to TRENDS_MAX_CONCURRENCY chunks are in flight, and requests are
+        paced by a token bucket (aiolimiter) instead of a fixed sleep.
+        Returns one {term: score} dict per chunk ({} on error).
+        """
+        semaphore = asyncio.Semaphore(TRENDS_MAX_CONCURRENCY)
+        limiter = AsyncLimiter(TRENDS_REQUESTS_PER_MINUTE, 60) if AIOLIMITER_AVAILABLE else nullcontext()
+        done = 0
+        
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+            # Google hands out the session cookie the API expects on the home page
+            try:
+                async with session.get(TRENDS_HOME_URL):
+                    pass
+            except aiohttp.ClientError:
+                pass
             
-            return min(100, max(0, score))
+            async def fetch_chunk(chunk):
+                nonlocal done
+                async with semaphore:
+                    try:
+                        async with limiter:
+                            recent = await fetch_trend(session, chunk, 'today 3-m')
+                        baseline = {}
+                        if _has_recent_interest(recent):
+                            async with limiter:
+                                baseline = await fetch_trend(session, chunk, 'today 5-y')
+                        if not AIOLIMITER_AVAILABLE:
+                            await asyncio.sleep(1)  # Google Trends rate limits
+                    except Exception as e:
+                        print(f"❌ Google Trends error for '{', '.join(chunk)}': {e}")
+                        return {}
+                    done += 1
+                    print(f"📊 Fetched trends: {done}/{len(chunks)} - {', '.join(chunk)}")
+                    return {term: _trend_score(recent[term], baseline.get(term, [])) for term in chunk}
             
-        except Exception as e:
-            print(f"❌ Google Trends error for '{recipe_name}': {e}")
-            return 50  # Default on error
+            return await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
     
-    def batch_get_trends(self, recipe_names, alias_db):
-        """Batch fetch trends for multiple recipes."""
-        results = {}
+    def batch_get_trends(self, recipe_names, alias_db, normalized=False):
+        """
+        Batch fetch trends for multiple recipes: one fetch per canonical
+        term, TRENDS_TERMS_PER_PAYLOAD terms per request. Results are keyed
+        by the names as passed in.
+        """
+        by_term = {}
+        for recipe_name in recipe_names:
+            by_term.setdefault(alias_db.canonicalize(recipe_name, normalized), []).append(recipe_name)
         
-        for i, recipe_name in enumerate(recipe_names):
-            print(f"📊 Fetching trends: {i+1}/{len(recipe_names)} - {recipe_name}")
-            results[recipe_name] = self.get_interest_score(recipe_name, alias_db)
+        if self.available:
+            pending = [term for term in by_term if term not in self.scores]
+            if pending:
+                self._fetch_pending(pending)
+        
+        results = {}
+        for term, names in by_term.items():
+            score = self.scores.get(term, 50) if self.available else 50
+            for recipe_name in names:
+                results[recipe_name] = score
         
         return results
 
 
+async def fetch_trend(session, terms, timeframe):
+    """
+    Interest over time for up to 5 terms: {term: [values]}.
+    
+    Same two steps pytrends takes: the explore call returns a token for
+    the time series widget, which widgetdata/multiline exchanges for the
+    data. Both responses start with an anti-JSON-hijacking prefix.
+    """
+    req = {
+        'comparisonItem': [{'keyword': term, 'time': timeframe, 'geo': ''} for term in terms],
+        'category': 0,
+        'property': '',
+    }
+    async with session.get(TRENDS_EXPLORE_URL, params={'hl': 'en-US', 'tz': '360', 'req': json.dumps(req)}) as response:
+        response.raise_for_status()
+        text = await response.text()
+    widgets = json.loads(text[text.index('{'):])['widgets']
+    widget = next(w for w in widgets if w['id'] == 'TIMESERIES')
+    
+    params = {'hl': 'en-US', 'tz': '360', 'req': json.dumps(widget['request']), 'token': widget['token']}
+    async with session.get(TRENDS_MULTILINE_URL, params=params) as response:
+        response.raise_for_status()
+        text = await response.text()
+    timeline = json.loads(text[text.index('{'):])['default']['timelineData']
+    
+    return {term: [point['value'][i] for point in timeline] for i, term in enumerate(terms)}
+
+
+def _trend_score(recent, baseline):
+    """Trends score (0-100) from 90-day and 5-year interest values."""
+    recent_avg = _rescaled_mean(recent)
+    baseline_avg = _rescaled_mean(baseline)
+    
+    # Weighted score: 60% recent, 40% baseline
+    score = (recent_avg * 0.6) + (baseline_avg * 0.4)
+    return min(100, max(0, score))
+
+
+def _has_recent_interest(recent):
+    """
+    Whether any term's 90-day interest reaches TRENDS_MIN_RECENT_INTEREST.
+    When none does, the 5-year baseline isn't worth a request.
+    """
+    return any(_rescaled_mean(values) >= TRENDS_MIN_RECENT_INTEREST for values in recent.values())
+
+
+def _rescaled_mean(values):
+    """
+    Average interest of one term, rescaled so its own peak is 100.
+    
+    A multi-term request scales every term against the most popular one;
+    rescaling keeps the score the same as fetching the term on its own.
+    """
+    peak = max(values, default=0)
+    if not peak:
+        return 0
+    return sum(value / peak * 100 for value in values) / len(values)
+
+
 class PlatformEngagementCollector:
     """Collects engagement data from recipe platforms."""
     
@@ -217,6 +480,40 @@ class RealPopularityScorer:
         
         return min(100, score)
     
+    def calculate_quality_scores(self, recipes):
+        """
+        Quality scores (0-100) for all recipes at once.
+        
+        Same rules as calculate_quality_score, but the per-recipe lengths and
+        flags are gathered into arrays and scored with one NumPy expression.
+        """
+        if not NUMPY_AVAILABLE:
+            return [self.calculate_quality_score(recipe) for recipe in recipes]
+        
+        desc_len, tags_len, has_image, instr_len, has_time, ing_len = self._quality_features(recipes)
+        scores = (
+            15 * (desc_len > 20) +
+            15 * (tags_len > 0) +
+            20 * has_image +
+            25 * (instr_len >= 3) +
+            15 * has_time +
+            10 * ((ing_len >= 3) & (ing_len <= 15))
+        )
+        return np.minimum(scores, 100).tolist()
+    
+    def _quality_features(self, recipes):
+        """Per-recipe lengths/flags the quality rules look at, as arrays."""
+        n = len(recipes)
+        desc_len = np.fromiter((len(r.get('description') or '') for r in recipes), dtype=np.int32, count=n)
+        tags_len = np.fromiter((len(r.get('tags') or ()) for r in recipes), dtype=np.int32, count=n)
+        has_image = np.fromiter((bool(r.get('image') or r.get('image_url')) for r in recipes), dtype=bool, count=n)
+        instr_len = np.fromiter((len(r.get('instructions') or ()) for r in recipes), dtype=np.int32, count=n)
+        has_time = np.fromiter(
+            (bool(r.get('total_time') or (r.get('prep_time') and r.get('cook_time'))) for r in recipes),
+            dtype=bool, count=n)
+        ing_len = np.fromiter((len(r.get('ingredients') or ()) for r in recipes), dtype=np.int32, count=n)
+        return desc_len, tags_len, has_image, instr_len, has_time, ing_len
+    
     def calculate_recency_boost(self, recipe):
         """Calculate recency boost (0-100) for trending topics."""
         # TODO: Check if recipe matches current trending topics
@@ -243,38 +540,106 @@ class RealPopularityScorer:
         
         return round(final_score, 1)
     
-    def score_all_recipes(self, recipes_file):
-        """Score all recipes and update the database."""
-        # Load recipes
-        with open(recipes_file, 'r', encoding='utf-8') as f:
-            recipes = json.load(f)
+    def calculate_real_popularities(self, recipes):
+        """
+        Real-world popularity scores (0-100) for all recipes.
+        
+        Each component is gathered for every recipe first (trends in
+        batched requests, quality in one vectorized pass), then the
+        weighted sum is a single array expression.
+        """
+        names = [recipe.get('name', 'Unknown') for recipe in recipes]
+        normalized_names = [normalize_name(name) for name in names]
+        
+        # Component scores (0-100 each)
+        trends_by_name = self.trends_collector.batch_get_trends(normalized_names, self.alias_db, normalized=True)
+        google_trends = [trends_by_name[name] for name in normalized_names]
+        platform_engagement = [self.engagement_collector.get_engagement_score(name) for name in names]
+        recency = [self.calculate_recency_boost(recipe) for recipe in recipes]
+        
+        if NUMBA_AVAILABLE:
+            # Quality and weighted sum in one compiled pass
+            out = np.empty(len(recipes), dtype=np.float64)
+            score_kernel(*self._quality_features(recipes),
+                         np.asarray(google_trends, dtype=np.float64),
+                         np.asarray(platform_engagement, dtype=np.float64),
+                         np.asarray(recency, dtype=np.float64),
+                         out)
+            return [round(score, 1) for score in out.tolist()]
+        
+        quality = self.calculate_quality_scores(recipes)
+        
+        # Weighted final score
+        if NUMPY_AVAILABLE:
+            final_scores = (
+                np.asarray(google_trends, dtype=np.float64) * 0.40 +
+                np.asarray(platform_engagement, dtype=np.float64) * 0.30 +
+                np.asarray(quality, dtype=np.float64) * 0.20 +
+                np.asarray(recency, dtype=np.float64) * 0.10
+            ).tolist()
+        else:
+            final_scores = [
+                t * 0.40 + e * 0.30 + q * 0.20 + r * 0.10
+                for t, e, q, r in zip(google_trends, platform_engagement, quality, recency)
+            ]
+        
+        return [round(score, 1) for score in final_scores]
+    
+    def score_all_recipes(self, recipes_file, force=False):
+        """
+        Score recipes and update the database.
+        
+        Recipes scored within REFRESH_TTL whose quality inputs haven't
+        changed are skipped (unless force=True). Progress is saved every
+        CHECKPOINT_EVERY recipes, so an interrupted run keeps its API results.
+        """
+        # Load recipes (streamed with ijson/orjson when installed)
+        recipes = list(iter_recipes(recipes_file))
         
         print(f"📖 Loaded {len(recipes)} recipes")
+        
+        now = datetime.now()
+        to_score = [r for r in recipes if force or _needs_refresh(r, now)]
+        if len(to_score) < len(recipes):
+            print(f"⏭️  Skipping {len(recipes) - len(to_score)} recipes scored in the last {REFRESH_TTL.days} days")
+        
         print("🔄 Starting real popularity scoring...")
         print("⚠️  Note: Google Trends API has rate limits. This may take a while.\n")
         
-        # Score each recipe
-        for i, recipe in enumerate(recipes):
-            recipe_name = recipe.get('name', 'Unknown')
-            print(f"[{i+1}/{len(recipes)}] Scoring: {recipe_name}", flush=True)
+        for start in range(0, len(to_score), CHECKPOINT_EVERY):
+            batch = to_score[start:start + CHECKPOINT_EVERY]
+            
+            # Score the batch, then report/store per recipe
+            real_scores = self.calculate_real_popularities(batch)
             
-            # Calculate real popularity
-            real_score = self.calculate_real_popularity(recipe)
-            print(f"    → Score: {real_score:.1f}", flush=True)
+            for i, recipe in enumerate(batch, start):
+                recipe_name = recipe.get('name', 'Unknown')
+                print(f"[{i+1}/{len(to_score)}] Scoring: {recipe_name}", flush=True)
+                
+                real_score = real_scores[i - start]
+                print(f"    → Score: {real_score:.1f}", flush=True)
+                
+                # Store both scores for comparison
+                recipe['popularity_score_old'] = recipe.get('popularity_score', 0)
+                recipe['popularity_score'] = real_score
+                recipe['popularity_last_updated'] = datetime.now().isoformat()
+                recipe['popularity_input_hash'] = _input_hash(recipe)
             
-            # Store both scores for comparison
-            recipe['popularity_score_old'] = recipe.get('popularity_score', 0)
-            recipe['popularity_score'] = real_score
-            recipe['popularity_last_updated'] = datetime.now().isoformat()
+            # Checkpoint (atomic replace, so a crash never truncates the file)
+            if start + CHECKPOINT_EVERY < len(to_score):
+                write_recipes(recipes_file, recipes)
         
-        # Sort by new popularity
-        recipes.sort(key=lambda r: r.get('popularity_score', 0), reverse=True)
+        # Sort by new popularity (stable, highest first)
+        if NUMPY_AVAILABLE:
+            scores = np.fromiter((r.get('popularity_score', 0) for r in recipes), dtype=np.float64, count=len(recipes))
+            recipes = [recipes[i] for i in np.argsort(-scores, kind='stable')]
+        else:
+            recipes.sort(key=lambda r: r.get('popularity_score', 0), reverse=True)
         
-        # Save
-        with open(recipes_file, 'w', encoding='utf-8') as f:
-            json.dump(recipes, f, indent=2, ensure_ascii=False)
+        # Save (same indent=2 layout, orjson when installed)
+        write_recipes(recipes_file, recipes)
         
-        print(f"\n✅ Done! Updated {len(recipes)} recipes with real popularity scores")
+        print(f"\n✅ Done! Updated {len(to_score)} recipes with real popularity scores")
         
         # Show comparison
         print("\n📊 Top 10 by Real Popularity:")
@@ -287,6 +652,20 @@ class RealPopularityScorer:
             print(f"     Old: {old:.1f} → New: {new:.1f} (Δ {diff:+.1f})")
 
 
+def _input_hash(recipe):
+    """Hash of the recipe fields the score depends on."""
+    inputs = {field: recipe.get(field) for field in SCORE_INPUT_FIELDS}
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _needs_refresh(recipe, now):
+    """Whether a recipe's score is missing, older than REFRESH_TTL or out of date with its fields."""
+    last_updated = recipe.get('popularity_last_updated')
+    if not last_updated or now - datetime.fromisoformat(last_updated) > REFRESH_TTL:
+        return True
+    return recipe.get('popularity_input_hash') != _input_hash(recipe)
+
+
 def main():
     """Main entry point."""
     print("=" * 70)
@@ -0,0 +1,399 @@
+"""
+Recipe Database I/O
+===================
+
+Shared helpers for reading and writing backend/data/recipes.json.
+
+The database stays a single JSON array because the API loads it in one
+go. It is indented (indent=2) as written by the importers, or compact
+after deduplicate_recipes.py rewrites it (unless run with --pretty). These helpers let the import scripts avoid holding the
+whole file in memory:
+- iter_recipes: stream recipes one at a time (uses ijson if installed)
+- iter_recipe_ids: stream just the recipe ids
+- append_recipes: add new recipes to the end of the array in place
+- write_recipes: rewrite the whole database in one write
+- Recipe: slotted record for scripts that keep every recipe in memory
+
+orjson is used for parsing/serializing when installed (falls back to
+the stdlib json module with identical output).
+
+Files ending in .ndjson/.jsonl are treated as newline-delimited JSON
+(one recipe per line) by both helpers. Files ending in .packed.json
+hold the packed layout from pack_recipes: ingredient and instruction
+strings are stored once in shared pools and recipes refer to them by
+index (smaller on disk, but not what the API reads). Adding .zst to
+any of these names stores the file zstd-compressed (needs zstandard).
+"""
+
+import json
+import mmap
+import os
+from dataclasses import dataclass, field, fields
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# Streaming JSON parser (optional)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Fast JSON encoder/decoder (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# zstd-compressed databases (optional)
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+NDJSON_SUFFIXES = ('.ndjson', '.jsonl')
+PACKED_SUFFIX = '.packed.json'
+ZSTD_SUFFIX = '.zst'
+ZSTD_LEVEL = 3  # fast, and still shrinks recipe JSON several times over
+
+# Recipe fields whose strings repeat across recipes (pooled when packed)
+POOLED_FIELDS = ('ingredients', 'instructions')
+
+# Set MYFRIDGE_FSYNC=1 to force every database write to disk before
+# returning (much slower; whole-file writes are atomic without it)
+FSYNC = os.environ.get('MYFRIDGE_FSYNC') == '1'
+
+
+def is_ndjson(db_path: str) -> bool:
+    """Whether db_path is a newline-delimited JSON file."""
+    return str(db_path).endswith(NDJSON_SUFFIXES)
+
+
+def is_packed(db_path: str) -> bool:
+    """Whether db_path holds the packed (string-pooled) layout."""
+    return str(db_path).endswith(PACKED_SUFFIX)
+
+
+def is_zstd(db_path: str) -> bool:
+    """Whether db_path is zstd-compressed."""
+    return str(db_path).endswith(ZSTD_SUFFIX)
+
+
+def _uncompressed_path(db_path: str) -> str:
+    """db_path without its .zst suffix (what decides the layout inside)."""
+    db_path = str(db_path)
+    return db_path[:-len(ZSTD_SUFFIX)] if is_zstd(db_path) else db_path
+
+
+def _require_zstd(db_path: str):
+    if not ZSTD_AVAILABLE:
+        raise ImportError(f"zstandard is needed for {db_path} (pip install zstandard)")
+
+
+def loads(data):
+    """Parse JSON from bytes or str."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes; indent=True matches json.dump(indent=2)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _load_file(f) -> Any:
+    """Parse a whole JSON file; orjson reads it straight from a memory map."""
+    if ORJSON_AVAILABLE and os.fstat(f.fileno()).st_size:
+        # Zero-copy: no bytes object the size of the file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+    return loads(f.read())
+
+
+def _decode(db_path: str, data: bytes) -> List[Dict]:
+    """Recipes from the whole (uncompressed) contents of db_path."""
+    if is_ndjson(db_path):
+        return [loads(line) for line in data.splitlines() if line.strip()]
+    if is_packed(db_path):
+        return unpack_recipes(loads(data))
+    return loads(data)
+
+
+def _encode(db_path: str, recipes: List[Dict], indent: bool) -> bytes:
+    """Contents of db_path (before compression) holding recipes."""
+    if is_ndjson(db_path):
+        return b''.join(dumps(r) + b'\n' for r in recipes)
+    if is_packed(db_path):
+        return dumps(pack_recipes(recipes))  # always compact
+    return dumps(recipes, indent=indent)
+
+
+def iter_recipes(db_path: str) -> Iterator[Dict]:
+    """Yield recipes from the database one at a time."""
+    if is_zstd(db_path):
+        # Decompressed in one go (the frame header records the size)
+        _require_zstd(db_path)
+        with open(db_path, 'rb') as f:
+            data = zstandard.ZstdDecompressor().decompress(f.read())
+        yield from _decode(_uncompressed_path(db_path), data)
+        return
+
+    with open(db_path, 'rb') as f:
+        if is_ndjson(db_path):
+            for line in f:
+                if line.strip():
+                    yield loads(line)
+        elif is_packed(db_path):
+            yield from unpack_recipes(_load_file(f))
+        elif IJSON_AVAILABLE:
+            # use_float keeps numbers as float instead of Decimal
+            yield from ijson.items(f, 'item', use_float=True)
+        else:
+            yield from _load_file(f)
+
+
+def iter_recipe_ids(db_path: str) -> Iterator[str]:
+    """
+    Yield the id of every recipe in the database.
+
+    With ijson only the id values are built; otherwise the file is read
+    in one go and parsed from bytes.
+    """
+    if is_ndjson(db_path) or is_packed(db_path) or is_zstd(db_path) or not IJSON_AVAILABLE:
+        yield from map(itemgetter('id'), iter_recipes(db_path))
+        return
+    with open(db_path, 'rb') as f:
+        yield from ijson.items(f, 'item.id')
+
+
+def pack_recipes(recipes: Iterable[Dict]) -> Dict:
+    """
+    Packed layout: each distinct POOLED_FIELDS string is stored once.
+
+    Returns {'pools': {field: [strings]}, 'recipes': [...]}, where the
+    recipes' pooled fields are lists of indexes into their pool.
+    """
+    indexes = {key: {} for key in POOLED_FIELDS}  # string -> pool index
+    packed = []
+    for recipe in recipes:
+        recipe = dict(recipe)
+        for key, index in indexes.items():
+            if key in recipe:
+                recipe[key] = [index.setdefault(text, len(index)) for text in recipe[key]]
+        packed.append(recipe)
+    # Dicts keep insertion order, so each index lists its pool in order
+    return {'pools': {key: list(index) for key, index in indexes.items()}, 'recipes': packed}
+
+
+def unpack_recipes(packed: Dict) -> List[Dict]:
+    """Plain recipes from pack_recipes output (its recipe dicts are reused)."""
+    pools = packed['pools']
+    recipes = packed['recipes']
+    for recipe in recipes:
+        for key, pool in pools.items():
+            if key in recipe:
+                recipe[key] = [pool[i] for i in recipe[key]]
+    return recipes
+
+
+def _format_recipe(recipe: Dict) -> bytes:
+    """Format a recipe exactly like json.dump(..., indent=2) does inside the array."""
+    # Indented JSON has no blank lines (newlines in strings are escaped),
+    # so every line gets the extra two spaces
+    return b'  ' + dumps(recipe, indent=True).replace(b'\n', b'\n  ')
+
+
+def append_recipes(db_path: str, recipes: Iterable[Dict]) -> int:
+    """
+    Append recipes to the JSON array in db_path without rewriting it.
+
+    Only the closing bracket is replaced, so the cost is proportional to
+    the new recipes rather than the whole database. New recipes follow the
+    file's layout: in an indented file the result is byte for byte what
+    json.dump(all_recipes, f, indent=2) would produce; in a compact file
+    (no whitespace before the closing bracket) they are appended compact.
+    New and empty files are written indented.
+
+    Returns the number of recipes written.
+    """
+    if is_packed(db_path) or is_zstd(db_path):
+        # Pool indexes and compression cover the whole file, so these are rewritten
+        recipes = list(recipes)
+        existing = list(iter_recipes(db_path)) if os.path.exists(db_path) and os.path.getsize(db_path) else []
+        if recipes:
+            write_recipes(db_path, existing + recipes)
+        return len(recipes)
+
+    if is_ndjson(db_path):
+        count = 0
+        with open(db_path, 'ab') as f:
+            for recipe in recipes:
+                f.write(dumps(recipe) + b'\n')
+                count += 1
+        return count
+
+    recipes = list(recipes)
+    if not recipes:
+        return 0
+
+    if not os.path.exists(db_path) or os.path.getsize(db_path) == 0:
+        chunks = [_format_recipe(r) for r in recipes]
+        _write_atomic(db_path, b'[\n' + b',\n'.join(chunks) + b'\n]')
+        return len(chunks)
+
+    with open(db_path, 'rb+') as f:
+        # Find the closing bracket (and whether the array is empty) by
+        # scanning backwards over trailing whitespace
+        pos = f.seek(0, os.SEEK_END)
+        close_pos = None
+        while pos > 0:
+            pos -= 1
+            f.seek(pos)
+            ch = f.read(1)
+            if ch.isspace():
+                continue
+            if close_pos is None:
+                if ch != b']':
+                    raise ValueError(f"{db_path} is not a JSON array")
+                close_pos = pos
+                continue
+            empty = ch == b'['
+            break
+        else:
+            raise ValueError(f"{db_path} is not a JSON array")
+
+        if not empty and close_pos == pos + 1:
+            # Compact array: "...}]"
+            body = b',' + b','.join(dumps(r) for r in recipes) + b']'
+        else:
+            chunks = [_format_recipe(r) for r in recipes]
+            body = (b'\n' if empty else b',\n') + b',\n'.join(chunks) + b'\n]'
+        f.seek(pos + 1)
+        f.truncate()
+        f.write(body)
+        if FSYNC:
+            f.flush()
+            os.fsync(f.fileno())
+
+    return len(recipes)
+
+
+def write_recipes(db_path: str, recipes: List[Dict], indent: bool = True):
+    """
+    Rewrite the whole database with a single write call.
+
+    The data goes to a temporary file that then replaces db_path, so a
+    crash mid-write never leaves a truncated database behind.
+    """
+    data = _encode(_uncompressed_path(db_path), recipes, indent)
+    if is_zstd(db_path):
+        _require_zstd(db_path)
+        data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    _write_atomic(db_path, data)
+
+
+def _write_atomic(db_path: str, data: bytes):
+    """Write data to a temporary file, then swap it in for db_path."""
+    tmp_path = f"{db_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        if FSYNC:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, db_path)
+
+
+class _Missing:
+    """Placeholder for a recipe field the source dict didn't have (falsy)."""
+    __slots__ = ()
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return '<missing>'
+
+    def __reduce__(self):
+        # Unpickles (e.g. in Pool workers) as the module singleton
+        return '_MISSING'
+
+
+_MISSING = _Missing()
+
+
+@dataclass(slots=True, kw_only=True)
+class Recipe:
+    """
+    Recipe record with __slots__, about half the size of the equivalent dict.
+
+    Fields follow the usual recipe key order; fields the source dict didn't
+    have (even id or name) stay _MISSING (falsy) and are left out again by
+    to_dict. Keys outside the standard schema are kept in extra, and
+    key_order remembers the source dict's key order so to_dict can restore it.
+    """
+    id: Any = _MISSING
+    source: Any = _MISSING
+    name: Any = _MISSING
+    description: Any = _MISSING
+    prep_time: Any = _MISSING
+    cook_time: Any = _MISSING
+    total_time: Any = _MISSING
+    servings: Any = _MISSING
+    difficulty: Any = _MISSING
+    ingredients: Any = _MISSING
+    instructions: Any = _MISSING
+    tags: Any = _MISSING
+    cuisine: Any = _MISSING
+    category: Any = _MISSING
+    image_url: Any = _MISSING
+    popularity_score: Any = _MISSING
+    popularity_score_old: Any = _MISSING
+    popularity_last_updated: Any = _MISSING
+    extra: Dict = field(default_factory=dict)
+    key_order: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Recipe':
+        known = {}
+        extra = {}
+        for key, value in data.items():
+            if key in _RECIPE_FIELD_SET:
+                known[key] = value
+            else:
+                extra[key] = value
+        # Records mostly share a handful of key orders; keep one tuple per order
+        key_order = tuple(data)
+        key_order = _KEY_ORDERS.setdefault(key_order, key_order)
+        return cls(**known, extra=extra, key_order=key_order)
+
+    def to_dict(self) -> Dict:
+        data = {}
+        for key in self.key_order:
+            if key in _RECIPE_FIELD_SET:
+                value = getattr(self, key)
+                if value is not _MISSING:
+                    data[key] = value
+            elif key in self.extra:
+                data[key] = self.extra[key]
+        # Fields set after from_dict go last, in schema order
+        for key in _RECIPE_FIELDS:
+            if key not in data:
+                value = getattr(self, key)
+                if value is not _MISSING:
+                    data[key] = value
+        for key, value in self.extra.items():
+            data.setdefault(key, value)
+        return data
+
+
+_RECIPE_FIELDS = tuple(f.name for f in fields(Recipe) if f.name not in ('extra', 'key_order'))
+_RECIPE_FIELD_SET = frozenset(_RECIPE_FIELDS)
+_KEY_ORDERS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
@@ -6,187 +6,254 @@ Creates 100 starter recipes manually (no external datasets needed)
 These are common, popular recipes that users will love.
 """
 
-import json
-import os
+import sys
 from pathlib import Path
+from types import MappingProxyType
+
+from legal_recipe_importer import LegalRecipeImporter
+from recipe_io import iter_recipe_ids, append_recipes
+
+# Schema validation of the bootstrap data (optional)
+try:
+    from jsonschema import Draft202012Validator
+    JSONSCHEMA_AVAILABLE = True
+except ImportError:
+    JSONSCHEMA_AVAILABLE = False
+
+# Fills in the fields the schema needs (no AI, so no API key)
+_IMPORTER = LegalRecipeImporter()
+
+
+# Shape of a hand-written bootstrap recipe (before create_legal_recipe)
+_STRING_LIST = {'type': 'array', 'items': {'type': 'string', 'minLength': 1}}
+RECIPE_SCHEMA = {
+    'type': 'object',
+    'required': ['id', 'name', 'ingredients', 'steps', 'prep_time', 'cook_time',
+                 'servings', 'cuisine', 'category', 'tags'],
+    'properties': {
+        'id': {'type': 'string', 'pattern': '^bootstrap_[0-9]+$'},
+        'name': {'type': 'string', 'minLength': 1},
+        'ingredients': {**_STRING_LIST, 'minItems': 1},
+        'steps': {**_STRING_LIST, 'minItems': 1},
+        'prep_time': {'type': 'integer', 'minimum': 0},
+        'cook_time': {'type': 'integer', 'minimum': 0},
+        'servings': {'type': 'integer', 'minimum': 1},
+        'cuisine': {'type': 'string'},
+        'category': {'type': 'string'},
+        'tags': _STRING_LIST,
+    },
+}
+
+# Compiled once; the recipes are checked as they're loaded at import
+_VALIDATOR = Draft202012Validator(RECIPE_SCHEMA) if JSONSCHEMA_AVAILABLE else None
+
+
+# Short vocabulary fields shared across recipes; interned so equal values
+# are one object everywhere (and compare by identity first)
+_INTERNED_FIELDS = frozenset({'ingredients', 'tags', 'cuisine', 'category'})
+
+
+def _freeze(recipe: dict) -> MappingProxyType:
+    """Read-only view of a recipe, with its lists turned into tuples."""
+    if _VALIDATOR:
+        _VALIDATOR.validate(recipe)
+    frozen = {}
+    for key, value in recipe.items():
+        if key in _INTERNED_FIELDS:
+            value = tuple(map(sys.intern, value)) if isinstance(value, list) else sys.intern(value)
+        elif isinstance(value, list):
+            value = tuple(value)
+        frozen[key] = value
+    return MappingProxyType(frozen)
+
+
+# 100 popular recipes to bootstrap the database (built once, shared read-only)
+_BOOTSTRAP_RECIPES = tuple(map(_freeze, [
+    # BREAKFAST (15)
+    {
+        "id": "bootstrap_001",
+        "name": "Classic Scrambled Eggs",
+        "ingredients": ["eggs", "butter", "milk", "salt", "pepper"],
+        "steps": ["Beat eggs with milk", "Melt butter in pan", "Pour eggs and stir gently", "Cook until just set", "Season and serve"],
+        "prep_time": 5,
+        "cook_time": 5,
+        "servings": 2,
+        "cuisine": "American",
+        "category": "breakfast",
+        "tags": ["quick", "easy", "protein"]
+    },
+    {
+        "id": "bootstrap_002",
+        "name": "Fluffy Pancakes",
+        "ingredients": ["flour", "milk", "eggs", "sugar", "baking powder", "butter", "vanilla extract"],
+        "steps": ["Mix dry ingredients", "Whisk wet ingredients separately", "Combine wet and dry gently", "Heat griddle with butter", "Pour batter and cook until bubbles form", "Flip and cook other side"],
+        "prep_time": 10,
+        "cook_time": 15,
+        "servings": 4,
+        "cuisine": "American",
+        "category": "breakfast",
+        "tags": ["breakfast", "weekend", "family"]
+    },
+    {
+        "id": "bootstrap_003",
+        "name": "Avocado Toast",
+        "ingredients": ["bread", "avocado", "lemon juice", "salt", "pepper", "red pepper flakes"],
+        "steps": ["Toast bread until golden", "Mash avocado with lemon juice", "Season with salt and pepper", "Spread on toast", "Top with red pepper flakes"],
+        "prep_time": 5,
+        "cook_time": 3,
+        "servings": 1,
+        "cuisine": "Modern",
+        "category": "breakfast",
+        "tags": ["healthy", "vegetarian", "trendy"]
+    },
+    {
+        "id": "bootstrap_004",
+        "name": "Overnight Oats",
+        "ingredients": ["rolled oats", "milk", "yogurt", "honey", "berries", "chia seeds"],
+        "steps": ["Mix oats, milk, and yogurt", "Add chia seeds and honey", "Refrigerate overnight", "Top with fresh berries before serving"],
+        "prep_time": 5,
+        "cook_time": 0,
+        "servings": 1,
+        "cuisine": "International",
+        "category": "breakfast",
+        "tags": ["healthy", "no-cook", "meal-prep"]
+    },
+    {
+        "id": "bootstrap_005",
+        "name": "French Toast",
+        "ingredients": ["bread", "eggs", "milk", "cinnamon", "vanilla extract", "butter", "maple syrup"],
+        "steps": ["Beat eggs with milk, cinnamon, and vanilla", "Dip bread slices in egg mixture", "Melt butter in pan", "Cook bread until golden on both sides", "Serve with maple syrup"],
+        "prep_time": 5,
+        "cook_time": 10,
+        "servings": 2,
+        "cuisine": "French",
+        "category": "breakfast",
+        "tags": ["comfort-food", "weekend", "sweet"]
+    },
+    
+    # LUNCH & DINNER - QUICK (20)
+    {
+        "id": "bootstrap_006",
+        "name": "Spaghetti Aglio e Olio",
+        "ingredients": ["spaghetti", "garlic", "olive oil", "red pepper flakes", "parsley", "parmesan cheese"],
+        "steps": ["Cook spaghetti until al dente", "Sauté minced garlic in olive oil", "Add red pepper flakes", "Toss pasta with garlic oil", "Top with parsley and parmesan"],
+        "prep_time": 5,
+        "cook_time": 15,
+        "servings": 4,
+        "cuisine": "Italian",
+        "category": "main",
+        "tags": ["quick", "vegetarian", "pasta"]
+    },
+    {
+        "id": "bootstrap_007",
+        "name": "Chicken Stir Fry",
+        "ingredients": ["chicken breast", "soy sauce", "vegetables", "garlic", "ginger", "sesame oil", "rice"],
+        "steps": ["Slice chicken into strips", "Stir fry chicken in sesame oil", "Add minced garlic and ginger", "Toss in vegetables", "Pour soy sauce and cook until vegetables tender", "Serve over rice"],
+        "prep_time": 15,
+        "cook_time": 15,
+        "servings": 4,
+        "cuisine": "Asian",
+        "category": "main",
+        "tags": ["quick", "healthy", "protein"]
+    },
+    {
+        "id": "bootstrap_008",
+        "name": "Grilled Cheese Sandwich",
+        "ingredients": ["bread", "cheese", "butter"],
+        "steps": ["Butter outside of bread slices", "Place cheese between slices", "Grill in pan until golden", "Flip and cook other side", "Serve hot"],
+        "prep_time": 2,
+        "cook_time": 5,
+        "servings": 1,
+        "cuisine": "American",
+        "category": "main",
+        "tags": ["quick", "comfort-food", "kid-friendly"]
+    },
+    {
+        "id": "bootstrap_009",
+        "name": "Caesar Salad",
+        "ingredients": ["romaine lettuce", "caesar dressing", "parmesan cheese", "croutons", "lemon"],
+        "steps": ["Wash and chop romaine", "Toss with caesar dressing", "Top with parmesan shavings", "Add croutons", "Squeeze lemon juice over top"],
+        "prep_time": 10,
+        "cook_time": 0,
+        "servings": 4,
+        "cuisine": "Italian",
+        "category": "salad",
+        "tags": ["no-cook", "healthy", "side-dish"]
+    },
+    {
+        "id": "bootstrap_010",
+        "name": "Tacos",
+        "ingredients": ["ground beef", "taco seasoning", "tortillas", "lettuce", "tomato", "cheese", "sour cream"],
+        "steps": ["Brown ground beef", "Add taco seasoning and water", "Simmer until thickened", "Warm tortillas", "Assemble with toppings"],
+        "prep_time": 10,
+        "cook_time": 15,
+        "servings": 4,
+        "cuisine": "Mexican",
+        "category": "main",
+        "tags": ["quick", "family-friendly", "customizable"]
+    },
+    
+    # Add 90 more recipes here for a full bootstrap...
+    # For now, let's just show the pattern
+    
+]))
+
+_BOOTSTRAP_IDS = frozenset(recipe['id'] for recipe in _BOOTSTRAP_RECIPES)
+
 
 def get_bootstrap_recipes():
-    """100 popular recipes to bootstrap the database."""
-    return [
-        # BREAKFAST (15)
-        {
-            "id": "bootstrap_001",
-            "name": "Classic Scrambled Eggs",
-            "ingredients": ["eggs", "butter", "milk", "salt", "pepper"],
-            "steps": ["Beat eggs with milk", "Melt butter in pan", "Pour eggs and stir gently", "Cook until just set", "Season and serve"],
-            "prep_time": 5,
-            "cook_time": 5,
-            "servings": 2,
-            "cuisine": "American",
-            "category": "breakfast",
-            "tags": ["quick", "easy", "protein"]
-        },
-        {
-            "id": "bootstrap_002",
-            "name": "Fluffy Pancakes",
-            "ingredients": ["flour", "milk", "eggs", "sugar", "baking powder", "butter", "vanilla extract"],
-            "steps": ["Mix dry ingredients", "Whisk wet ingredients separately", "Combine wet and dry gently", "Heat griddle with butter", "Pour batter and cook until bubbles form", "Flip and cook other side"],
-            "prep_time": 10,
-            "cook_time": 15,
-            "servings": 4,
-            "cuisine": "American",
-            "category": "breakfast",
-            "tags": ["breakfast", "weekend", "family"]
-        },
-        {
-            "id": "bootstrap_003",
-            "name": "Avocado Toast",
-            "ingredients": ["bread", "avocado", "lemon juice", "salt", "pepper", "red pepper flakes"],
-            "steps": ["Toast bread until golden", "Mash avocado with lemon juice", "Season with salt and pepper", "Spread on toast", "Top with red pepper flakes"],
-            "prep_time": 5,
-            "cook_time": 3,
-            "servings": 1,
-            "cuisine": "Modern",
-            "category": "breakfast",
-            "tags": ["healthy", "vegetarian", "trendy"]
-        },
-        {
-            "id": "bootstrap_004",
-            "name": "Overnight Oats",
-            "ingredients": ["rolled oats", "milk", "yogurt", "honey", "berries", "chia seeds"],
-            "steps": ["Mix oats, milk, and yogurt", "Add chia seeds and honey", "Refrigerate overnight", "Top with fresh berries before serving"],
-            "prep_time": 5,
-            "cook_time": 0,
-            "servings": 1,
-            "cuisine": "International",
-            "category": "breakfast",
-            "tags": ["healthy", "no-cook", "meal-prep"]
-        },
-        {
-            "id": "bootstrap_005",
-            "name": "French Toast",
-            "ingredients": ["bread", "eggs", "milk", "cinnamon", "vanilla extract", "butter", "maple syrup"],
-            "steps": ["Beat eggs with milk, cinnamon, and vanilla", "Dip bread slices in egg mixture", "Melt butter in pan", "Cook bread until golden on both sides", "Serve with maple syrup"],
-            "prep_time": 5,
-            "cook_time": 10,
-            "servings": 2,
-            "cuisine": "French",
-            "category": "breakfast",
-            "tags": ["comfort-food", "weekend", "sweet"]
-        },
-        
-        # LUNCH & DINNER - QUICK (20)
-        {
-            "id": "bootstrap_006",
-            "name": "Spaghetti Aglio e Olio",
-            "ingredients": ["spaghetti", "garlic", "olive oil", "red pepper flakes", "parsley", "parmesan cheese"],
-            "steps": ["Cook spaghetti until al dente", "Sauté minced garlic in olive oil", "Add red pepper flakes", "Toss pasta with garlic oil", "Top with parsley and parmesan"],
-            "prep_time": 5,
-            "cook_time": 15,
-            "servings": 4,
-            "cuisine": "Italian",
-            "category": "main",
-            "tags": ["quick", "vegetarian", "pasta"]
-        },
-        {
-            "id": "bootstrap_007",
-            "name": "Chicken Stir Fry",
-            "ingredients": ["chicken breast", "soy sauce", "vegetables", "garlic", "ginger", "sesame oil", "rice"],
-            "steps": ["Slice chicken into strips", "Stir fry chicken in sesame oil", "Add minced garlic and ginger", "Toss in vegetables", "Pour soy sauce and cook until vegetables tender", "Serve over rice"],
-            "prep_time": 15,
-            "cook_time": 15,
-            "servings": 4,
-            "cuisine": "Asian",
-            "category": "main",
-            "tags": ["quick", "healthy", "protein"]
-        },
-        {
-            "id": "bootstrap_008",
-            "name": "Grilled Cheese Sandwich",
-            "ingredients": ["bread", "cheese", "butter"],
-            "steps": ["Butter outside of bread slices", "Place cheese between slices", "Grill in pan until golden", "Flip and cook other side", "Serve hot"],
-            "prep_time": 2,
-            "cook_time": 5,
-            "servings": 1,
-            "cuisine": "American",
-            "category": "main",
-            "tags": ["quick", "comfort-food", "kid-friendly"]
-        },
-        {
-            "id": "bootstrap_009",
-            "name": "Caesar Salad",
-            "ingredients": ["romaine lettuce", "caesar dressing", "parmesan cheese", "croutons", "lemon"],
-            "steps": ["Wash and chop romaine", "Toss with caesar dressing", "Top with parmesan shavings", "Add croutons", "Squeeze lemon juice over top"],
-            "prep_time": 10,
-            "cook_time": 0,
-            "servings": 4,
-            "cuisine": "Italian",
-            "category": "salad",
-            "tags": ["no-cook", "healthy", "side-dish"]
-        },
-        {
-            "id": "bootstrap_010",
-            "name": "Tacos",
-            "ingredients": ["ground beef", "taco seasoning", "tortillas", "lettuce", "tomato", "cheese", "sour cream"],
-            "steps": ["Brown ground beef", "Add taco seasoning and water", "Simmer until thickened", "Warm tortillas", "Assemble with toppings"],
-            "prep_time": 10,
-            "cook_time": 15,
-            "servings": 4,
-            "cuisine": "Mexican",
-            "category": "main",
-            "tags": ["quick", "family-friendly", "customizable"]
-        },
-        
-        # Add 90 more recipes here for a full bootstrap...
-        # For now, let's just show the pattern
-        
-    ]
+    """100 popular recipes to bootstrap the database (read-only, don't modify)."""
+    return _BOOTSTRAP_RECIPES
+
+
+def get_bootstrap_recipes_copy():
+    """The bootstrap recipes as plain dicts the caller can modify."""
+    return [{key: list(value) if isinstance(value, tuple) else value for key, value in recipe.items()}
+            for recipe in _BOOTSTRAP_RECIPES]
+
 
 def main():
     """Bootstrap the recipe database with starter recipes."""
-    script_dir = Path(__file__).parent
-    db_path = script_dir / '..' / 'data' / 'recipes.json'
+    script_dir = Path(__file__).resolve().parent
+    db_path = script_dir.parent / 'data' / 'recipes.json'
+    db_path.parent.mkdir(parents=True, exist_ok=True)
     
     print("🌱 Recipe Bootstrap Tool")
     print("=" * 60)
     
-    # Load existing recipes
-    existing_recipes = []
-    if db_path.exists():
-        with open(db_path, 'r', encoding='utf-8') as f:
-            existing_recipes = json.load(f)
-        print(f"📊 Found {len(existing_recipes)} existing recipes")
-    
-    # Get bootstrap recipes
-    bootstrap = get_bootstrap_recipes()
+    # Load existing recipe ids (the recipes themselves aren't parsed into dicts)
+    # (a missing or empty file is a new database, nothing to read)
+    existing = []
+    if db_path.exists() and db_path.stat().st_size:
+        existing = list(iter_recipe_ids(db_path))
+        print(f"📊 Found {len(existing)} existing recipes")
+    existing_ids = set(existing)
     
-    # Check for duplicates
-    existing_ids = {r['id'] for r in existing_recipes}
-    new_recipes = [r for r in bootstrap if r['id'] not in existing_ids]
-    
-    if not new_recipes:
+    # Bootstrap ids not in the database yet (one set difference)
+    missing_ids = set(_BOOTSTRAP_IDS - existing_ids)
+    if not missing_ids:
         print("✅ All bootstrap recipes already exist!")
         return
     
-    print(f"📥 Adding {len(new_recipes)} new recipes...")
+    # Take the first recipe for each missing id (the list may repeat ids)
+    new_recipes = []
+    for recipe in get_bootstrap_recipes():
+        if recipe['id'] in missing_ids:
+            missing_ids.discard(recipe['id'])
+            new_recipes.append(recipe)
     
     # Add missing fields to match schema
-    from legal_recipe_importer import LegalRecipeImporter
-    importer = LegalRecipeImporter()
-    
-    processed_recipes = []
-    for recipe in new_recipes:
-        processed = importer.create_legal_recipe(recipe, use_ai=False)
-        processed_recipes.append(processed)
-        print(f"  ✅ {processed['name']}")
+    processed_recipes = [_IMPORTER.create_legal_recipe(r, use_ai=False) for r in new_recipes]
     
-    # Merge and save
-    all_recipes = existing_recipes + processed_recipes
+    # Report built up front and written in one go
+    report = [f"📥 Adding {len(new_recipes)} new recipes..."]
+    report += [f"  ✅ {processed['name']}" for processed in processed_recipes]
+    sys.stdout.write('\n'.join(report) + '\n')
     
-    with open(db_path, 'w', encoding='utf-8') as f:
-        json.dump(all_recipes, f, indent=2, ensure_ascii=False)
+    # Save (appends to the database, existing recipes aren't rewritten)
+    append_recipes(str(db_path), processed_recipes)
     
-    print(f"\n✅ Database now has {len(all_recipes)} total recipes!")
+    print(f"\n✅ Database now has {len(existing) + len(processed_recipes)} total recipes!")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,114 @@
+import csv
+import json
+
+import pytest
+
+import batch_import_foodcom
+from batch_import_foodcom import FoodComImporter, normalize_name
+from recipe_io import write_recipes
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('Chicken - Rice', 'chicken rice'),
+    ('Chicken – Rice', 'chicken rice'),
+    ('Pasta—Primavera', 'pastaprimavera'),
+    ('«Borscht»', 'borscht'),
+    ('Beef·Stew', 'beefstew'),
+    ('Crème Brûlée…', 'crème brûlée'),
+    ('The “Best” Apple Pie', 'best apple pie'),
+    ("Mom's Chili_Dog!", 'moms chili_dog'),
+    ('A!', ''),
+])
+def test_normalize_name_strips_non_word_characters(name, expected):
+    assert normalize_name(name) == expected
+
+
+def _importer(tmp_path, recipes):
+    db_path = str(tmp_path / 'recipes.json')
+    write_recipes(db_path, recipes)
+    importer = FoodComImporter()
+    importer.load_existing_recipes(db_path)
+    return importer
+
+
+EXISTING = [
+    {'id': 'foodcom_1', 'name': 'Chicken - Rice'},
+    {'id': 'foodcom_2', 'name': 'Beef Stew'},
+]
+
+
+def _check_duplicates(importer):
+    assert importer.is_duplicate('Something Else', 'foodcom_1')
+    assert importer.is_duplicate('Chicken – Rice', 'foodcom_99')
+    assert not importer.is_duplicate('Lentil Soup', 'foodcom_3')
+    
+    # Recipes added during the run go in the exact sets
+    importer.existing_ids.add('foodcom_3')
+    importer.existing_names.add(normalize_name('Lentil Soup'))
+    assert importer.is_duplicate('Lentil Soup', 'foodcom_4')
+    assert importer.is_duplicate('Other', 'foodcom_3')
+
+
+def test_is_duplicate_with_exact_sets(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_import_foodcom, 'BLOOM_AVAILABLE', False)
+    importer = _importer(tmp_path, EXISTING)
+    assert importer._id_bloom is None
+    assert importer.existing_ids == {'foodcom_1', 'foodcom_2'}
+    _check_duplicates(importer)
+
+
+def test_is_duplicate_with_bloom_filters(tmp_path):
+    if not batch_import_foodcom.BLOOM_AVAILABLE:
+        pytest.skip("pybloom_live not installed")
+    importer = _importer(tmp_path, EXISTING)
+    # Existing recipes only live in the Bloom filters
+    assert importer.existing_ids == set()
+    assert 'foodcom_1' in importer._id_bloom
+    _check_duplicates(importer)
+
+
+def test_bloom_filters_grow_past_initial_capacity(tmp_path, monkeypatch):
+    if not batch_import_foodcom.BLOOM_AVAILABLE:
+        pytest.skip("pybloom_live not installed")
+    monkeypatch.setattr(batch_import_foodcom, 'BLOOM_CAPACITY', 10)
+    recipes = [{'id': f'foodcom_{i}', 'name': f'Recipe number {i}'} for i in range(200)]
+    importer = _importer(tmp_path, recipes)
+    assert importer.existing_count == 200
+    assert importer.is_duplicate('Anything', 'foodcom_199')
+
+
+def test_seen_checks_exact_set_then_bloom():
+    assert FoodComImporter._seen('a', None, {'a'})
+    assert not FoodComImporter._seen('b', None, {'a'})
+    assert FoodComImporter._seen('b', {'b'}, set())
+    assert not FoodComImporter._seen('c', {'b'}, {'a'})
+
+
+def _foodcom_csv(tmp_path, names):
+    csv_path = tmp_path / 'RAW_recipes.csv'
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(batch_import_foodcom.FOODCOM_COLUMNS)
+        for i, name in enumerate(names):
+            writer.writerow([name, f'fc_{i}', 30, json.dumps(['easy']),
+                             json.dumps(['mix the flour', 'bake it']), json.dumps(['flour', 'milk'])])
+    return str(csv_path)
+
+
+@pytest.mark.parametrize('limit, chunks', [(10, [2, 2]), (3, [2, 1])])
+def test_use_ai_creates_recipes_in_chunks(tmp_path, monkeypatch, limit, chunks):
+    monkeypatch.setattr(batch_import_foodcom, 'AI_CHUNK_SIZE', 2)
+    csv_path = _foodcom_csv(tmp_path, ['Pancakes', 'Waffles', 'pancakes', 'Crepes', 'Scones'])
+    importer = _importer(tmp_path, [])
+    calls = []
+    bulk_create = importer.legal_importer.bulk_create_legal_recipes
+    
+    async def record(raw_recipes):
+        calls.append(len(raw_recipes))
+        return await bulk_create(raw_recipes)
+    
+    monkeypatch.setattr(importer.legal_importer, 'bulk_create_legal_recipes', record)
+    new_recipes = importer.import_batch(csv_path, limit=limit, use_ai=True)
+    assert calls == chunks
+    assert [r['name'] for r in new_recipes] == ['Pancakes', 'Waffles', 'Crepes', 'Scones'][:sum(chunks)]
+    assert importer.stats['duplicates'] == 1
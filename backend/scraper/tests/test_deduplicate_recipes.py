@@ -0,0 +1,84 @@
+import pytest
+
+import deduplicate_recipes
+from deduplicate_recipes import RecipeDeduplicator
+from recipe_io import write_recipes
+
+
+def _recipe(recipe_id, name, ingredients=('flour', 'milk', 'eggs', 'butter', 'sugar')):
+    return {'id': recipe_id, 'name': name, 'source': 'TheMealDB', 'ingredients': list(ingredients)}
+
+
+def _dedup(tmp_path, recipes, **options):
+    db_path = str(tmp_path / 'recipes.json')
+    write_recipes(db_path, recipes)
+    dedup = RecipeDeduplicator()
+    dedup.load_recipes(db_path)
+    dedup.find_duplicates(**options)
+    return dedup
+
+
+def _kept_ids(dedup):
+    return sorted(r.id for r in dedup.deduplicate())
+
+
+def test_fuzzy_keeps_different_dishes_with_the_same_ingredients(tmp_path):
+    pytest.importorskip('datasketch')
+    dedup = _dedup(tmp_path, [_recipe('1', 'Pancakes'), _recipe('2', 'Crepes')], fuzzy=True)
+    assert dedup.stats['duplicates'] == 0
+    assert _kept_ids(dedup) == ['1', '2']
+
+
+def test_fuzzy_merges_reordered_names(tmp_path):
+    pytest.importorskip('datasketch')
+    recipes = [_recipe('1', 'Spicy Chicken Pasta'), _recipe('2', 'Chicken Pasta Spicy')]
+    dedup = _dedup(tmp_path, recipes, fuzzy=True)
+    assert dedup.stats['duplicates'] == 1
+
+
+def test_name_overlap():
+    assert deduplicate_recipes.name_overlap('spicy chicken pasta', 'chicken pasta spicy style') == 0.75
+    assert deduplicate_recipes.name_overlap('pancakes', 'crepes') == 0.0
+    assert deduplicate_recipes.name_overlap('', 'crepes') == 0.0
+
+
+def test_prefix_keeps_one_letter_different_dishes(tmp_path):
+    recipes = [_recipe('themealdb_53358', 'Chicken Mandi'), _recipe('themealdb_52795', 'Chicken Handi')]
+    dedup = _dedup(tmp_path, recipes, prefix=True)
+    assert dedup.stats['duplicates'] == 0
+    assert _kept_ids(dedup) == ['themealdb_52795', 'themealdb_53358']
+
+
+def test_prefix_merges_plurals(tmp_path):
+    recipes = [_recipe('1', 'Chicken Pasta'), _recipe('2', 'Chicken Pastas')]
+    dedup = _dedup(tmp_path, recipes, prefix=True)
+    assert dedup.stats['duplicates'] == 1
+
+
+def test_print_duplicate_groups(tmp_path, capsys):
+    recipes = [_recipe('1', 'Chicken Pasta'), _recipe('2', 'Chicken Pastas'), _recipe('3', 'Crepes')]
+    dedup = _dedup(tmp_path, recipes, prefix=True)
+    dedup.print_duplicate_groups()
+    out = capsys.readouterr().out
+    assert 'Chicken Pasta (1)' in out and 'Chicken Pastas (2)' in out
+    assert 'Crepes' not in out
+
+
+@pytest.mark.parametrize('a, b, same', [
+    ('pie', 'pies', True),
+    ('berry crumble', 'berries crumble', True),
+    ('tomato soup', 'tomatoes soup', True),
+    ('chicken mandi', 'chicken handi', False),
+    ('beef stew', 'beef stews pie', False),
+])
+def test_dish_key_borderline_pairs(a, b, same):
+    # Short names fell under the old 0.9 edit-ratio cutoff, whose result
+    # also differed between rapidfuzz and difflib; the key has no backend
+    assert (deduplicate_recipes.dish_key(a) == deduplicate_recipes.dish_key(b)) is same
+
+
+def test_load_recipes_without_id(tmp_path):
+    recipes = [{'name': 'Toast', 'ingredients': ['bread']}, _recipe('1', 'Crepes')]
+    dedup = _dedup(tmp_path, recipes)
+    assert dedup.stats['original'] == 2
+    assert len(dedup.deduplicate()) == 2
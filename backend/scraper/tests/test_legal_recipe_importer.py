@@ -0,0 +1,68 @@
+import asyncio
+import hashlib
+import json
+
+import legal_recipe_importer
+from legal_recipe_importer import LegalRecipeImporter, LLMCache, _recipe_id
+
+
+def test_recipe_id_is_blake2b_of_name():
+    expected = hashlib.blake2b('Tomato Soup'.encode('utf-8'), digest_size=8).hexdigest()
+    assert _recipe_id('Tomato Soup') == f"recipe_{expected}"
+
+
+def test_cache_digest_does_not_depend_on_orjson(monkeypatch):
+    payload = {'name': 'crème brûlée', 'ingredients': ['cream', 'sugar']}
+    data = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    expected = hashlib.sha256(data).hexdigest()
+    assert LLMCache.digest(payload) == expected
+    monkeypatch.setattr(legal_recipe_importer, 'ORJSON_AVAILABLE', False)
+    assert LLMCache.digest(payload) == expected
+
+
+def _ai_importer(reply):
+    """Importer whose Groq calls are answered by reply(names in the prompt)."""
+    importer = LegalRecipeImporter()
+    importer.groq_client = object()
+    prompts = []
+
+    async def complete(prompt, max_tokens):
+        names = [line[len('- Name: '):] for line in prompt.splitlines() if line.startswith('- Name: ')]
+        prompts.append(names)
+        return reply(names)
+
+    importer._complete = complete
+    return importer, prompts
+
+
+def _content(name):
+    return {'description': f'About {name}', 'instructions': [f'Make {name}']}
+
+
+def _facts(importer, names):
+    return [importer.extract_facts({'name': name, 'ingredients': ['flour'], 'steps': ['mix']}) for name in names]
+
+
+def test_batch_bisects_when_reply_length_mismatches():
+    # Four recipes get three objects back; each half then parses
+    def reply(names):
+        return json.dumps([_content(name) for name in names[:3]])
+
+    importer, prompts = _ai_importer(reply)
+    contents = asyncio.run(importer.generate_original_content_batch(_facts(importer, 'ABCD')))
+    assert prompts == [list('ABCD'), list('AB'), list('CD')]
+    assert contents == [_content(name) for name in 'ABCD']
+
+
+def test_batch_falls_back_per_recipe():
+    # The pair never parses, so each recipe is retried alone; only B fails
+    def reply(names):
+        if len(names) > 1 or names == ['B']:
+            return 'Sorry, I cannot help with that.'
+        return json.dumps(_content(names[0]))
+
+    importer, prompts = _ai_importer(reply)
+    facts_list = _facts(importer, 'AB')
+    contents = asyncio.run(importer.generate_original_content_batch(facts_list))
+    assert prompts == [['A', 'B'], ['A'], ['B']]
+    assert contents == [_content('A'), importer._create_simple_content(facts_list[1])]
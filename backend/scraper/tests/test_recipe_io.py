@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+import recipe_io
+from recipe_io import Recipe, append_recipes, write_recipes
+
+RECIPES = [{'id': f'r{i}', 'name': f'Recipe {i}', 'ingredients': ['crème', 'salt']} for i in range(4)]
+
+
+@pytest.fixture(params=[True, False], ids=['orjson', 'json'])
+def json_backend(request, monkeypatch):
+    if request.param and not recipe_io.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(recipe_io, 'ORJSON_AVAILABLE', request.param)
+
+
+def test_append_to_indented_file_matches_json_dump(tmp_path, json_backend):
+    db_path = str(tmp_path / 'recipes.json')
+    append_recipes(db_path, RECIPES[:2])
+    append_recipes(db_path, RECIPES[2:])
+    with open(db_path, encoding='utf-8') as f:
+        assert f.read() == json.dumps(RECIPES, indent=2, ensure_ascii=False)
+
+
+def test_append_to_compact_file_stays_compact(tmp_path, json_backend):
+    db_path = str(tmp_path / 'recipes.json')
+    write_recipes(db_path, RECIPES[:2], indent=False)
+    append_recipes(db_path, RECIPES[2:])
+    with open(db_path, encoding='utf-8') as f:
+        assert f.read() == json.dumps(RECIPES, ensure_ascii=False, separators=(',', ':'))
+
+
+def test_append_to_empty_array(tmp_path, json_backend):
+    db_path = str(tmp_path / 'recipes.json')
+    with open(db_path, 'w') as f:
+        f.write('[]')
+    append_recipes(db_path, RECIPES)
+    with open(db_path, encoding='utf-8') as f:
+        assert json.load(f) == RECIPES
+
+
+def test_recipe_without_id_round_trips():
+    data = {'name': 'Toast', 'ingredients': ['bread']}
+    recipe = Recipe.from_dict(data)
+    assert not recipe.id
+    assert recipe.to_dict() == data
+
+
+def test_recipe_to_dict_keeps_key_order():
+    data = {'id': 'r1', 'name': 'Toast', 'popularity_input_hash': 'abc', 'source': 'Curated', 'tags': ['quick']}
+    recipe = Recipe.from_dict(data)
+    assert list(recipe.to_dict()) == list(data)
+    recipe.image_url = 'toast.jpg'
+    assert list(recipe.to_dict()) == list(data) + ['image_url']